@@ -324,7 +324,7 @@ class DialogoConfiguracoes(QDialog):
         layout = QVBoxLayout()
 
         self.lista_stopwords = QListWidget()
-        self.lista_stopwords.addItems(configurador.obter_stopwords_personalizadas())
+        self.lista_stopwords.addItems(sorted(configurador.obter_stopwords_personalizadas()))
         layout.addWidget(self.lista_stopwords)
 
         form_layout = QHBoxLayout()
@@ -374,7 +374,7 @@ class DialogoConfiguracoes(QDialog):
         """
         stopwords = configurador.obter_stopwords_personalizadas()
         self.lista_stopwords.clear()
-        self.lista_stopwords.addItems(sorted(set(stopwords)))
+        self.lista_stopwords.addItems(sorted(stopwords))
         extrator_conceitos.adicionar_stopwords(stopwords)
         gerador_links_avancado.atualizar_stopwords_personalizadas(stopwords)
 
@@ -1027,11 +1027,11 @@ class SmartNoteApp(QMainWindow):
         self.config_busca = configurador.obter_config_busca()
 
         # Configurações de links semânticos
-        config_links = configurador.obter_config_links()
+        config_links = configurador.snapshot_links
         gerador_links.configurar_parametros(
-            limiar_similaridade=config_links.get('limiar_similaridade', 0.15),
-            max_links_por_paragrafo=config_links.get('max_links_por_paragrafo', 3),
-            modo_semantico=config_links.get('modo_semantico_ativo', True)
+            limiar_similaridade=config_links.limiar_similaridade,
+            max_links_por_paragrafo=config_links.max_links_por_paragrafo,
+            modo_semantico=config_links.modo_semantico_ativo
         )
 
         # Assistente IA
@@ -1145,8 +1145,7 @@ class SmartNoteApp(QMainWindow):
                 Dicionário com os títulos das notas como chave 
                 e listas de links sugeridos como valor.
         """
-        config_links = configurador.obter_config_links()
-        modo_semantico_ativo = config_links.get('modo_semantico_ativo', True)
+        modo_semantico_ativo = configurador.snapshot_links.modo_semantico_ativo
 
         # Verifica se todos os links são semânticos
         apenas_semanticos = all(
@@ -1209,8 +1208,7 @@ class SmartNoteApp(QMainWindow):
             links_sugeridos (Dict[str, List[LinkSugerido]]): 
                 Links gerados agrupados por título de nota.
         """
-        config_links = configurador.obter_config_links()
-        modo_semantico_ativo = config_links.get('modo_semantico_ativo', True)
+        modo_semantico_ativo = configurador.snapshot_links.modo_semantico_ativo
 
         apenas_semanticos = all(
             all(link.tipo == "semantico" for link in lista)
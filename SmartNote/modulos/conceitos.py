@@ -12,9 +12,12 @@ Descrição: Módulo de extração avançada de conceitos com suporte a NLP via
 ===============================================================================
 """
 
+import os
 import re
+import sys
 import logging
-from typing import List, Dict, Set, Optional
+import multiprocessing
+from typing import List, Dict, Set, Optional, Iterable, Tuple
 from collections import Counter
 from dataclasses import dataclass, field
 from modulos.configuracao import configurador
@@ -33,11 +36,149 @@ except ImportError:
     logger.warning("spaCy não disponível. Usando extração básica de conceitos.")
     SPACY_DISPONIVEL = False
 
+# ==============================================================================
+# Verificação de Dependências Opcionais (Numba)
+# ==============================================================================
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_DISPONIVEL = True
+except ImportError:
+    NUMBA_DISPONIVEL = False
+
+# A partir deste número de textos por extrair (e com mais de um processo),
+# extrair_conceitos_lote distribui a extração por um pool de processos
+LIMIAR_CONCEITOS_MULTIPROCESSO = 64
+
+# ==============================================================================
+# Categorias Gramaticais (pos_tag)
+# ==============================================================================
+
+# Conjunto fixo de etiquetas atribuídas aos conceitos; internadas para que todas
+# as instâncias partilhem o mesmo objeto str.
+_POS_PERSON = sys.intern('PERSON')
+_POS_ORG = sys.intern('ORG')
+_POS_GPE = sys.intern('GPE')
+_POS_PRODUCT = sys.intern('PRODUCT')
+_POS_COMPOUND_NOUN = sys.intern('COMPOUND_NOUN')
+_POS_ACRONYM = sys.intern('ACRONYM')
+_POS_TECHNICAL = sys.intern('TECHNICAL')
+_POS_NOUN = sys.intern('NOUN')
+_POS_WORD = sys.intern('WORD')
+
+_POS_ENTIDADES = {
+    _POS_PERSON: _POS_PERSON,
+    _POS_ORG: _POS_ORG,
+    _POS_GPE: _POS_GPE,
+    _POS_PRODUCT: _POS_PRODUCT,
+}
+
+# Número máximo de termos distintos produzidos por cada estratégia de extração
+# antes da consolidação (que mantém apenas os 20 melhores). As repetições dos
+# termos aceites continuam a ser produzidas, para a frequência ficar correta.
+MAX_CONCEITOS_POR_FONTE = 40
+
+# Limites a partir dos quais a extração de contextos usa o scanner compilado
+# com Numba; abaixo disto o custo de preparação supera o ganho.
+LIMIAR_JIT_CARACTERES = 20_000
+LIMIAR_JIT_TERMOS = 30
+
+# Stopwords padrão utilizadas para filtrar termos genéricos
+STOPWORDS_PADRAO = frozenset({
+    'coisa', 'algo', 'alguém', 'pessoa',
+    'forma', 'modo', 'tipo', 'exemplo', 'caso', 'situação',
+    'hoje', 'ontem', 'amanhã', 'agora', 'depois', 'antes',
+    'momento', 'tempo', 'vez',
+    'muito', 'pouco', 'algum', 'todo',
+    'lugar', 'local', 'área', 'parte'
+})
+
+# ==============================================================================
+# Utilitários de Texto
+# ==============================================================================
+
+_RE_SEPARADOR_FRASES = re.compile(r'[.!?]+')
+_RE_SIGLAS = re.compile(r'\b[A-Z]{2,5}\b')                      # Siglas (2 a 5 maiúsculas)
+_RE_TERMOS_TECNICOS = re.compile(r'\b\w+[-_]\w+(?:[-_]\w+)*\b')  # Termos com hífen ou underscore
+
+
+def _e_caractere_palavra(caractere: str) -> bool:
+    """
+    Verifica se o caractere faz parte de uma palavra (equivalente a \\w em regex).
+
+    Args:
+        caractere (str): Caractere a verificar.
+
+    Returns:
+        bool: True se for alfanumérico ou underscore.
+    """
+    return caractere.isalnum() or caractere == '_'
+
+
+if NUMBA_DISPONIVEL:
+
+    @njit(cache=True)
+    def _procurar_padroes(texto, palavra, padroes, offsets, inicios, fins, max_por_padrao):
+        """
+        Procura vários padrões em todas as frases de um texto (versão compilada).
+
+        Args:
+            texto (np.ndarray): Code points do texto em minúsculas (uint32).
+            palavra (np.ndarray): Máscara (uint8) com 1 nos caracteres de palavra.
+            padroes (np.ndarray): Code points de todos os padrões concatenados.
+            offsets (np.ndarray): Início de cada padrão em `padroes` (n + 1 entradas).
+            inicios (np.ndarray): Posição inicial de cada frase no texto.
+            fins (np.ndarray): Posição final (exclusiva) de cada frase no texto.
+            max_por_padrao (int): Número máximo de frases a devolver por padrão.
+
+        Returns:
+            np.ndarray: Matriz (n_padroes, max_por_padrao) com os índices das frases
+                        onde cada padrão ocorre como palavra inteira, ou -1.
+        """
+        n_padroes = offsets.shape[0] - 1
+        resultado = np.full((n_padroes, max_por_padrao), -1, np.int32)
+
+        for p in range(n_padroes):
+            a = offsets[p]
+            tamanho = offsets[p + 1] - a
+            encontrados = 0
+            if tamanho == 0:
+                continue
+
+            for f in range(inicios.shape[0]):
+                ini = inicios[f]
+                fim = fins[f]
+                i = ini
+                while i + tamanho <= fim:
+                    igual = True
+                    for k in range(tamanho):
+                        if texto[i + k] != padroes[a + k]:
+                            igual = False
+                            break
+                    if igual:
+                        esquerdo = i == ini or palavra[i - 1] == 0
+                        direito = i + tamanho == fim or palavra[i + tamanho] == 0
+                        if esquerdo and direito:
+                            resultado[p, encontrados] = f
+                            encontrados += 1
+                            break
+                    i += 1
+                if encontrados >= max_por_padrao:
+                    break
+
+        return resultado
+
 # ==============================================================================
 # Estrutura de Dados
 # ==============================================================================
 
-@dataclass
+# `slots=True` só existe a partir do Python 3.10; em versões anteriores a
+# dataclass mantém o __dict__ por instância.
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Conceito:
     """
     Representa um conceito identificado a partir de texto.
@@ -68,48 +209,77 @@ class ExtratorConceitos:
         """
         Inicializa o extrator com o modelo linguístico desejado.
 
+        O modelo spaCy só é carregado no primeiro acesso a `nlp`, e as stopwords
+        personalizadas da configuração no primeiro acesso a `stopwords_personalizadas`.
+
         Args:
             modelo_spacy (str): Nome do modelo spaCy a carregar.
         """
-        self.nlp = None
+        self._modelo_nome = modelo_spacy
+        self._nlp = None
+        self._nlp_carregado = False
 
-        if SPACY_DISPONIVEL:
-            try:
-                self.nlp = spacy.load(modelo_spacy)
-                logger.info(f"Modelo spaCy '{modelo_spacy}' carregado com sucesso.")
-            except OSError:
-                logger.warning(f"Modelo '{modelo_spacy}' não encontrado. Extração ativada.")
+        self._stopwords: Optional[Set[str]] = None
 
         self.cache_conceitos: Dict[str, List[Conceito]] = {}
-        self.stopwords_personalizadas: Set[str] = set()
-
-        self._carregar_stopwords_padrao()
-        self.adicionar_stopwords(configurador.obter_stopwords_personalizadas())
 
     
+    # ==============================================================================
+    # Carregamento Preguiçoso do Modelo spaCy
+    # ==============================================================================
+
+    @property
+    def nlp(self):
+        """
+        Modelo spaCy, carregado apenas na primeira utilização.
+
+        Returns:
+            Optional[spacy.language.Language]: Modelo carregado ou None se indisponível.
+        """
+        if not self._nlp_carregado:
+            self._nlp_carregado = True
+            if SPACY_DISPONIVEL:
+                try:
+                    self._nlp = spacy.load(self._modelo_nome)
+                    logger.info(f"Modelo spaCy '{self._modelo_nome}' carregado com sucesso.")
+                except OSError:
+                    logger.warning(f"Modelo '{self._modelo_nome}' não encontrado. Extração ativada.")
+        return self._nlp
+
+    @nlp.setter
+    def nlp(self, modelo):
+        """
+        Define explicitamente o modelo spaCy a utilizar.
+
+        Args:
+            modelo (Optional[spacy.language.Language]): Modelo carregado ou None.
+        """
+        self._nlp = modelo
+        self._nlp_carregado = True
+
     # ==============================================================================
     # Métodos: Carregamento e Gestão de Stopwords
     # ==============================================================================
 
-    def _carregar_stopwords_padrao(self):
+    @property
+    def stopwords_personalizadas(self) -> Set[str]:
         """
-        Inicializa a lista de stopwords padrão utilizadas para filtrar termos genéricos.
+        Stopwords do extrator, completadas com as da configuração na primeira utilização.
+
+        Returns:
+            Set[str]: Conjunto de stopwords em minúsculas.
         """
-        self.stopwords_personalizadas.update([
-            'coisa', 'algo', 'alguém', 'pessoa',
-            'forma', 'modo', 'tipo', 'exemplo', 'caso', 'situação',
-            'hoje', 'ontem', 'amanhã', 'agora', 'depois', 'antes',
-            'momento', 'tempo', 'vez',
-            'muito', 'pouco', 'algum', 'todo',
-            'lugar', 'local', 'área', 'parte'
-        ])
+        if self._stopwords is None:
+            self._stopwords = set(STOPWORDS_PADRAO)
+            self._stopwords.update(palavra.lower() for palavra in configurador.obter_stopwords_personalizadas())
+        return self._stopwords
 
-    def adicionar_stopwords(self, palavras: List[str]):
+    def adicionar_stopwords(self, palavras: Iterable[str]):
         """
-        Adiciona uma lista de palavras à lista de stopwords personalizadas.
+        Adiciona palavras ao conjunto de stopwords personalizadas.
 
         Args:
-            palavras (List[str]): Lista de palavras a ignorar durante a extração.
+            palavras (Iterable[str]): Palavras a ignorar durante a extração.
         """
         self.stopwords_personalizadas.update(palavra.lower() for palavra in palavras)
 
@@ -146,28 +316,66 @@ class ExtratorConceitos:
 
         return conceitos_filtrados
 
+    def extrair_conceitos_lote(self, pares: List[Tuple[str, str]], processos: int = 1) -> List[List[Conceito]]:
+        """
+        Extrai os conceitos de vários textos, opcionalmente num pool de processos.
 
-    def _extrair_entidades_nomeadas(self, texto: str) -> List[Conceito]:
+        A extração é trabalho de CPU em Python e cada texto é independente, por
+        isso, com `processos > 1` e pelo menos `LIMIAR_CONCEITOS_MULTIPROCESSO`
+        textos fora do cache, os textos são distribuídos por processos (spawn),
+        cada um com o seu modelo spaCy. Os resultados ficam no cache deste extrator.
+
+        Args:
+            pares (List[Tuple[str, str]]): Pares (texto, título da nota).
+            processos (int): Número máximo de processos a usar.
+
+        Returns:
+            List[List[Conceito]]: Conceitos de cada texto, pela ordem de `pares`.
+        """
+        em_falta = [
+            (texto, titulo) for texto, titulo in dict.fromkeys(pares)
+            if texto and hash(texto + titulo) not in self.cache_conceitos
+        ]
+
+        if processos > 1 and len(em_falta) >= LIMIAR_CONCEITOS_MULTIPROCESSO and self.nlp:
+            contexto = multiprocessing.get_context("spawn")
+            with contexto.Pool(
+                processes=min(processos, os.cpu_count() or 1),
+                initializer=_iniciar_processo_conceitos,
+                initargs=(self._modelo_nome, frozenset(self.stopwords_personalizadas)),
+            ) as pool:
+                resultados = pool.map(_extrair_conceitos_processo, em_falta, chunksize=8)
+            for (texto, titulo), conceitos in zip(em_falta, resultados):
+                self.cache_conceitos[hash(texto + titulo)] = conceitos
+
+        return [self.extrair_conceitos_avancados(texto, titulo) for texto, titulo in pares]
+
+
+    def _extrair_entidades_nomeadas(self, texto: str,
+                                    max_por_fonte: int = MAX_CONCEITOS_POR_FONTE) -> List[Conceito]:
         """
         Utiliza NER (Named Entity Recognition) do spaCy para extrair entidades com alta relevância.
 
         Args:
             texto (str): Texto de origem.
+            max_por_fonte (int): Número máximo de termos distintos a produzir.
 
         Returns:
             List[Conceito]: Lista de conceitos baseados em entidades.
         """
         conceitos = []
+        vistos = set()
         doc = self.nlp(texto)
 
         for ent in doc.ents:
-            if len(ent.text.strip()) > 2 and ent.label_ in {'PERSON', 'ORG', 'GPE', 'PRODUCT'}:
+            pos_tag = _POS_ENTIDADES.get(ent.label_)
+            if len(ent.text.strip()) > 2 and pos_tag:
                 termo_limpo = self._limpar_termo(ent.text)
-                if termo_limpo and self._validar_conceito(termo_limpo):
+                if termo_limpo and self._admitir_termo(termo_limpo, vistos, max_por_fonte):
                     conceitos.append(Conceito(
                         termo=termo_limpo,
                         frequencia=1,
-                        pos_tag=ent.label_,
+                        pos_tag=pos_tag,
                         relevancia=0.9,
                         contextos=[ent.sent.text[:100]]
                     ))
@@ -178,17 +386,20 @@ class ExtratorConceitos:
     # Métodos: Extração de Substantivos Compostos e Termos Técnicos
     # ==============================================================================
 
-    def _extrair_substantivos_compostos(self, texto: str) -> List[Conceito]:
+    def _extrair_substantivos_compostos(self, texto: str,
+                                        max_por_fonte: int = MAX_CONCEITOS_POR_FONTE) -> List[Conceito]:
         """
         Extrai substantivos compostos a partir da análise de dependência sintática.
 
         Args:
             texto (str): Texto alvo da análise.
+            max_por_fonte (int): Número máximo de termos distintos a produzir.
 
         Returns:
             List[Conceito]: Lista de conceitos compostos encontrados.
         """
         conceitos = []
+        vistos = set()
         doc = self.nlp(texto)
 
         for token in doc:
@@ -208,11 +419,11 @@ class ExtratorConceitos:
                 termo_composto = " ".join(termos)
                 termo_limpo = self._limpar_termo(termo_composto)
 
-                if termo_limpo and self._validar_conceito(termo_limpo):
+                if termo_limpo and self._admitir_termo(termo_limpo, vistos, max_por_fonte):
                     conceitos.append(Conceito(
                         termo=termo_limpo,
                         frequencia=1,
-                        pos_tag='COMPOUND_NOUN',
+                        pos_tag=_POS_COMPOUND_NOUN,
                         relevancia=0.8,
                         contextos=[token.sent.text[:100]]
                     ))
@@ -220,6 +431,30 @@ class ExtratorConceitos:
         return conceitos
 
 
+    def _admitir_termo(self, termo: str, vistos: set, max_por_fonte: int) -> bool:
+        """
+        Decide se uma ocorrência de um termo entra na lista de uma estratégia de extração.
+
+        Termos já aceites são sempre admitidos (cada repetição conta para a frequência);
+        termos novos só são validados e aceites enquanto houver menos de
+        `max_por_fonte` termos distintos.
+
+        Args:
+            termo (str): Termo já limpo.
+            vistos (set): Termos distintos aceites até agora (atualizado no local).
+            max_por_fonte (int): Número máximo de termos distintos.
+
+        Returns:
+            bool: True se a ocorrência deve ser incluída.
+        """
+        if termo in vistos:
+            return True
+        if len(vistos) >= max_por_fonte or not self._validar_conceito(termo):
+            return False
+        vistos.add(termo)
+        return True
+
+
     def _expandir_termo_composto(self, doc, inicio: int) -> str:
         """
         Expande um termo composto a partir de um índice no documento spaCy.
@@ -258,35 +493,33 @@ class ExtratorConceitos:
         """
         conceitos = []
 
-        # Extrair siglas (2 a 5 letras maiúsculas)
-        padrao_siglas = r'\b[A-Z]{2,5}\b'
-        siglas = re.findall(padrao_siglas, texto)
-
-        for sigla in set(siglas):
-            if self._validar_conceito(sigla):
-                freq = texto.count(sigla)
-                conceitos.append(Conceito(
-                    termo=sigla,
-                    frequencia=freq,
-                    pos_tag='ACRONYM',
-                    relevancia=0.7,
-                    contextos=self._extrair_contextos(texto, sigla)
-                ))
+        # Extrair siglas (2 a 5 letras maiúsculas); a frequência vem do próprio findall
+        siglas = Counter(_RE_SIGLAS.findall(texto))
+        siglas_validas = [s for s in siglas if self._validar_conceito(s)]
 
         # Extrair termos com hífen ou underscore
-        padrao_tecnicos = r'\b\w+[-_]\w+(?:[-_]\w+)*\b'
-        termos_tecnicos = re.findall(padrao_tecnicos, texto)
-
-        for termo in set(termos_tecnicos):
-            if self._validar_conceito(termo):
-                freq = texto.count(termo)
-                conceitos.append(Conceito(
-                    termo=termo,
-                    frequencia=freq,
-                    pos_tag='TECHNICAL',
-                    relevancia=0.6,
-                    contextos=self._extrair_contextos(texto, termo)
-                ))
+        termos_tecnicos = Counter(_RE_TERMOS_TECNICOS.findall(texto))
+        tecnicos_validos = [t for t in termos_tecnicos if self._validar_conceito(t)]
+
+        contextos = self._extrair_contextos_lote(texto, siglas_validas + tecnicos_validos)
+
+        for sigla in siglas_validas:
+            conceitos.append(Conceito(
+                termo=sigla,
+                frequencia=siglas[sigla],
+                pos_tag=_POS_ACRONYM,
+                relevancia=0.7,
+                contextos=contextos[sigla]
+            ))
+
+        for termo in tecnicos_validos:
+            conceitos.append(Conceito(
+                termo=termo,
+                frequencia=termos_tecnicos[termo],
+                pos_tag=_POS_TECHNICAL,
+                relevancia=0.6,
+                contextos=contextos[termo]
+            ))
 
         return conceitos
 
@@ -295,12 +528,14 @@ class ExtratorConceitos:
     # Métodos: Extração Baseada em Frequência e Utilitários de Validação
     # ==============================================================================
 
-    def _extrair_por_frequencia(self, texto: str) -> List[Conceito]:
+    def _extrair_por_frequencia(self, texto: str,
+                                max_por_fonte: int = MAX_CONCEITOS_POR_FONTE) -> List[Conceito]:
         """
         Extrai conceitos com base na frequência de ocorrência de termos compostos e substantivos.
 
         Args:
             texto (str): Texto completo da nota.
+            max_por_fonte (int): Número máximo de conceitos a produzir (os mais frequentes).
 
         Returns:
             List[Conceito]: Lista de conceitos extraídos com frequência significativa.
@@ -328,17 +563,19 @@ class ExtratorConceitos:
                 if termo_limpo and self._validar_conceito(termo_limpo):
                     contador_termos[termo_limpo] += 1
 
-        # 3. Converter para objetos Conceito
-        for termo, freq in contador_termos.items():
-            if freq >= 2:
-                relevancia = min(0.5 + (freq * 0.1), 1.0)
-                conceitos.append(Conceito(
-                    termo=termo,
-                    frequencia=freq,
-                    pos_tag='NOUN',
-                    relevancia=relevancia,
-                    contextos=self._extrair_contextos(texto, termo)
-                ))
+        # 3. Converter para objetos Conceito (dos mais frequentes para os menos)
+        frequentes = [(t, f) for t, f in contador_termos.most_common(max_por_fonte) if f >= 2]
+        contextos = self._extrair_contextos_lote(texto, [t for t, _ in frequentes])
+
+        for termo, freq in frequentes:
+            relevancia = min(0.5 + (freq * 0.1), 1.0)
+            conceitos.append(Conceito(
+                termo=termo,
+                frequencia=freq,
+                pos_tag=_POS_NOUN,
+                relevancia=relevancia,
+                contextos=contextos[termo]
+            ))
 
         return conceitos
 
@@ -394,19 +631,104 @@ class ExtratorConceitos:
             List[str]: Lista de frases parciais com o termo.
         """
         contextos = []
-        frases = re.split(r'[.!?]+', texto)
+        termo_lower = termo.lower()
+        tamanho = len(termo_lower)
+
+        for frase in _RE_SEPARADOR_FRASES.split(texto):
+            frase_lower = frase.lower()
+            inicio = frase_lower.find(termo_lower)
+
+            # Procura por substring (str.find) e confirma os limites de palavra
+            while inicio != -1:
+                fim = inicio + tamanho
+                limite_esquerdo = inicio == 0 or not _e_caractere_palavra(frase_lower[inicio - 1])
+                limite_direito = fim == len(frase_lower) or not _e_caractere_palavra(frase_lower[fim])
+                if limite_esquerdo and limite_direito:
+                    contexto = frase.strip()[:100]
+                    if contexto:
+                        contextos.append(contexto)
+                    break
+                inicio = frase_lower.find(termo_lower, inicio + 1)
 
-        for frase in frases:
-            if re.search(rf'(?<!\w){re.escape(termo)}(?!\w)', frase, re.IGNORECASE):
-                contexto = frase.strip()[:100]
-                if contexto:
-                    contextos.append(contexto)
             if len(contextos) >= max_contextos:
                 break
 
         return contextos
 
     
+    def _extrair_contextos_lote(self, texto: str, termos: List[str],
+                                max_contextos: int = 3) -> Dict[str, List[str]]:
+        """
+        Extrai os contextos de vários termos de uma só vez.
+
+        Em textos longos com muitos termos (e com Numba disponível) usa um scanner
+        compilado; caso contrário recorre a `_extrair_contextos` termo a termo.
+
+        Args:
+            texto (str): Texto completo.
+            termos (List[str]): Termos para busca.
+            max_contextos (int): Número máximo de contextos por termo.
+
+        Returns:
+            Dict[str, List[str]]: Contextos encontrados para cada termo.
+        """
+        if (
+            NUMBA_DISPONIVEL and
+            len(texto) > LIMIAR_JIT_CARACTERES and
+            len(termos) > LIMIAR_JIT_TERMOS
+        ):
+            texto_lower = texto.lower()
+            # A conversão para minúsculas pode alterar o comprimento (ex.: 'İ')
+            if len(texto_lower) == len(texto):
+                return self._extrair_contextos_jit(texto, texto_lower, termos, max_contextos)
+
+        return {termo: self._extrair_contextos(texto, termo, max_contextos) for termo in termos}
+
+    def _extrair_contextos_jit(self, texto: str, texto_lower: str, termos: List[str],
+                               max_contextos: int) -> Dict[str, List[str]]:
+        """
+        Prepara os buffers e executa `_procurar_padroes` sobre o texto.
+
+        Args:
+            texto (str): Texto completo original.
+            texto_lower (str): Texto em minúsculas, com o mesmo comprimento.
+            termos (List[str]): Termos para busca.
+            max_contextos (int): Número máximo de contextos por termo.
+
+        Returns:
+            Dict[str, List[str]]: Contextos encontrados para cada termo.
+        """
+        buffer = np.frombuffer(texto_lower.encode('utf-32-le'), dtype=np.uint32)
+
+        # Máscara de caracteres de palavra (\w) calculada pelo motor de regex
+        mascara = re.sub(r'\w', '\x01', re.sub(r'\W', '\x00', texto_lower))
+        palavra = np.frombuffer(mascara.encode('latin-1'), dtype=np.uint8)
+
+        # Limites das frases, equivalentes a _RE_SEPARADOR_FRASES.split(texto)
+        inicios, fins = [0], []
+        for separador in _RE_SEPARADOR_FRASES.finditer(texto_lower):
+            fins.append(separador.start())
+            inicios.append(separador.end())
+        fins.append(len(texto_lower))
+
+        padroes_lower = [termo.lower() for termo in termos]
+        padroes = np.frombuffer(''.join(padroes_lower).encode('utf-32-le'), dtype=np.uint32)
+        offsets = np.zeros(len(padroes_lower) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(p) for p in padroes_lower])
+
+        resultado = _procurar_padroes(
+            buffer, palavra, padroes, offsets,
+            np.asarray(inicios, dtype=np.int64), np.asarray(fins, dtype=np.int64),
+            max_contextos
+        )
+
+        contextos = {}
+        for i, termo in enumerate(termos):
+            contextos[termo] = [
+                texto[inicios[f]:fins[f]].strip()[:100] for f in resultado[i] if f >= 0
+            ]
+        return contextos
+
     # ==============================================================================
     # Métodos: Consolidação de Conceitos e Extração Básica (Fallback)
     # ==============================================================================
@@ -458,6 +780,18 @@ class ExtratorConceitos:
         self.cache_conceitos.clear()
 
 
+    def reiniciar_apos_fork(self):
+        """
+        Descarta o modelo spaCy e o cache herdados de um processo pai.
+
+        Chamado no processo filho após um fork; o modelo volta a ser carregado
+        no primeiro acesso a `nlp`.
+        """
+        self._nlp = None
+        self._nlp_carregado = False
+        self.cache_conceitos = {}
+
+
     def extrair_conceitos_basicos(self, texto: str) -> List[Conceito]:
         """
         Extrai conceitos básicos usando regex, frequência e filtros simples.
@@ -480,33 +814,40 @@ class ExtratorConceitos:
         contador = Counter(p.lower() for p in palavras)
 
         # 2. Conceitos por frequência e validação
-        for palavra, freq in contador.items():
+        palavras_validas = [
+            palavra for palavra, freq in contador.items()
             if (
                 freq >= 1 and
                 self._validar_conceito(palavra) and
                 palavra not in self.stopwords_personalizadas
-            ):
-                relevancia = min(0.3 + (freq * 0.1), 1.0)
-                conceitos.append(Conceito(
-                    termo=palavra,
-                    frequencia=freq,
-                    pos_tag='WORD',
-                    relevancia=relevancia,
-                    contextos=self._extrair_contextos(texto, palavra)
-                ))
+            )
+        ]
 
         # 3. Siglas e termos técnicos (acréscimo opcional)
-        siglas = re.findall(r'\b[A-Z]{2,5}\b', texto)
-        for sigla in set(siglas):
-            if self._validar_conceito(sigla):
-                freq = texto.count(sigla)
-                conceitos.append(Conceito(
-                    termo=sigla,
-                    frequencia=freq,
-                    pos_tag='ACRONYM',
-                    relevancia=0.7,
-                    contextos=self._extrair_contextos(texto, sigla)
-                ))
+        siglas = Counter(_RE_SIGLAS.findall(texto))
+        siglas_validas = [s for s in siglas if self._validar_conceito(s)]
+
+        contextos = self._extrair_contextos_lote(texto, palavras_validas + siglas_validas)
+
+        for palavra in palavras_validas:
+            freq = contador[palavra]
+            relevancia = min(0.3 + (freq * 0.1), 1.0)
+            conceitos.append(Conceito(
+                termo=palavra,
+                frequencia=freq,
+                pos_tag=_POS_WORD,
+                relevancia=relevancia,
+                contextos=contextos[palavra]
+            ))
+
+        for sigla in siglas_validas:
+            conceitos.append(Conceito(
+                termo=sigla,
+                frequencia=siglas[sigla],
+                pos_tag=_POS_ACRONYM,
+                relevancia=0.7,
+                contextos=contextos[sigla]
+            ))
 
         conceitos.sort(key=lambda c: (c.relevancia, c.frequencia), reverse=True)
         return conceitos[:15]  # Máximo de 15 conceitos básicos
@@ -517,3 +858,25 @@ class ExtratorConceitos:
 # ==============================================================================
 
 extrator_conceitos = ExtratorConceitos()
+
+
+def _iniciar_processo_conceitos(modelo_spacy: str, stopwords: frozenset):
+    """
+    Prepara o extrator global num processo do pool de `extrair_conceitos_lote`.
+
+    Args:
+        modelo_spacy (str): Modelo spaCy usado pelo processo principal.
+        stopwords (frozenset): Stopwords do extrator do processo principal.
+    """
+    global extrator_conceitos
+    extrator_conceitos = ExtratorConceitos(modelo_spacy)
+    extrator_conceitos._stopwords = set(stopwords)  # Já inclui as da configuração
+
+
+def _extrair_conceitos_processo(par: Tuple[str, str]) -> List[Conceito]:
+    """Extrai os conceitos de um par (texto, título) num processo do pool."""
+    return extrator_conceitos.extrair_conceitos_avancados(*par)
+
+# os.register_at_fork não existe em Windows
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=extrator_conceitos.reiniciar_apos_fork)
@@ -12,15 +12,289 @@ Descrição: Sistema de configuração persistente
 ===============================================================================
 """
 
-import json
 import os
+import re
+import json
+import sys
 import logging
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Dict, Any, Optional, FrozenSet, Iterable, Union, Callable, BinaryIO
 
 STOPWORDS_PATH = "config/stopwords.json"  # Caminho fixo para ficheiro de stopwords personalizadas
 logger = logging.getLogger(__name__)
 
 
+# ==============================================================================
+# Serialização JSON (leitura com orjson, se disponível)
+# ==============================================================================
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _json_dumps(dados: Any) -> bytes:
+    """
+    Serializa os dados em JSON indentado (UTF-8).
+
+    A escrita usa sempre o módulo json, porque o orjson só indenta com 2 espaços
+    e o formato dos ficheiros de configuração (4 espaços) não deve depender das
+    dependências instaladas.
+    """
+    return json.dumps(dados, ensure_ascii=False, indent=4).encode('utf-8')
+
+
+def _escrever_atomico(caminho: str, dados: Union[bytes, Callable[[BinaryIO], None]]):
+    """
+    Escreve os dados num ficheiro temporário e substitui o destino de forma atómica.
+
+    Um erro a meio da escrita não deixa um ficheiro truncado, e um ficheiro
+    anterior mapeado em memória continua válido até ser substituído.
+
+    Args:
+        caminho (str): Caminho do ficheiro de destino.
+        dados (Union[bytes, Callable[[BinaryIO], None]]): Conteúdo a escrever, ou
+            função que escreve o conteúdo no ficheiro aberto.
+    """
+    temporario = caminho + ".tmp"
+    try:
+        with open(temporario, 'wb') as f:
+            if callable(dados):
+                dados(f)
+            else:
+                f.write(dados)
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+# ==============================================================================
+# Configurações Padrão
+# ==============================================================================
+
+def _construir_configuracoes_padrao() -> Dict[str, Any]:
+    """
+    Constrói o dicionário com todas as configurações padrão do SmartNote.
+
+    As configurações abrangem desde parâmetros do modelo de IA até aspectos
+    de interface, desempenho e privacidade.
+
+    Returns:
+        Dict[str, Any]: Estrutura com valores padrão organizados por categoria.
+    """
+    return {
+        # ----------------------------------------------------------------------
+        # Configurações do modelo de IA
+        # ----------------------------------------------------------------------
+        "modelo_ia": {
+            "nome": "tinyllama",                     
+            "url_ollama": "http://localhost:11434", 
+            "timeout": 30,
+            "temperatura": 0.7,
+            "max_tokens": 1024,                    
+            "ativar_ollama": True
+        },
+
+        # ----------------------------------------------------------------------
+        # Embeddings para similaridade semântica
+        # ----------------------------------------------------------------------
+        "embeddings": {
+            "modelo": "all-MiniLM-L6-v2",             
+            "dimensoes": 384,
+            "cache_embeddings": True,
+            "quantizacao": "fp32"                     # "fp32" ou "sq8" (int8)
+        },
+
+        # ----------------------------------------------------------------------
+        # Geração de links automáticos
+        # ----------------------------------------------------------------------
+        "links": {
+            "limiar_similaridade": 0.50,
+            "max_links_por_paragrafo": 3,
+            "aplicar_apenas_primeira_ocorrencia": True,
+            "modo_semantico_ativo": True,
+            "confirmar_antes_aplicar": True
+        },
+
+        # ----------------------------------------------------------------------
+        # Configurações de busca
+        # ----------------------------------------------------------------------
+        "busca": {
+            "destaque_cor": "#FFFF00",            
+            "ignorar_acentos": True,
+            "busca_semantica_ativa": True,
+            "max_resultados": 50
+        },
+
+        # ----------------------------------------------------------------------
+        # Personalização da interface
+        # ----------------------------------------------------------------------
+        "interface": {
+            "tema": "claro",
+            "fonte_tamanho": 12,
+            "fonte_familia": "Arial",
+            "texto_negrito": False,              
+            "texto_italico": False,                  
+            "mostrar_backlinks": True,
+            "auto_salvar": True,
+            "intervalo_auto_salvar": 300            
+        },
+
+        # ----------------------------------------------------------------------
+        # Desempenho e limites
+        # ----------------------------------------------------------------------
+        "performance": {
+            "max_notas_cache": 500,                    
+            "max_embeddings_cache": 2000,
+            "reindexar_automaticamente": False,
+            "threads_processamento": 1,
+            "encode_multiprocesso": False,            # Usa vários processos para gerar embeddings (mais RAM)
+            "encoder_int8": False                     # Quantiza o modelo de embeddings para int8 (CPU, mais rápido)
+        },
+
+        # ----------------------------------------------------------------------
+        # Privacidade e anonimato
+        # ----------------------------------------------------------------------
+        "privacidade": {
+            "modo_offline": True,
+            "salvar_historico_pesquisa": False,
+            "logs_detalhados": False
+        },
+
+        # ----------------------------------------------------------------------
+        # RAG (Retrieval-Augmented Generation)
+        # ----------------------------------------------------------------------
+        "rag": {
+            "max_documentos_contexto": 3,
+            "limiar_relevancia": 0.35,
+            "max_caracteres_contexto": 2000
+        }
+    }
+
+
+# Construídas uma única vez na importação do módulo
+_CONFIGURACOES_PADRAO = _construir_configuracoes_padrao()
+_SECOES_VALIDAS = frozenset(_CONFIGURACOES_PADRAO)
+
+
+# ==============================================================================
+# Regras de Validação
+# ==============================================================================
+
+_AUSENTE = object()  # Marca chaves ausentes na configuração validada
+_PREFIXOS_URL = ("http://", "https://")
+_RE_NOME_MODELO = re.compile(r"[^/]{3,}")  # Pelo menos 3 caracteres, sem '/'
+_MODOS_QUANTIZACAO = frozenset({"fp32", "sq8"})
+
+
+def _numero(valor: Any) -> bool:
+    """Verifica se o valor é numérico (int ou float)."""
+    return isinstance(valor, (int, float))
+
+
+def _intervalo_01(valor: Any) -> bool:
+    """Verifica se o valor é numérico e está entre 0.0 e 1.0."""
+    return _numero(valor) and 0.0 <= valor <= 1.0
+
+
+def _nome_modelo_valido(nome: Any) -> bool:
+    """Verifica se o nome do modelo é uma string com formato válido."""
+    return isinstance(nome, str) and ConfiguradorSmartNote.validar_nome_modelo(nome)
+
+
+def _url_ollama_valida(url: Any) -> bool:
+    """Verifica se a URL do Ollama está vazia ou tem formato válido."""
+    return not url or (isinstance(url, str) and ConfiguradorSmartNote.validar_url_ollama(url))
+
+
+# (seção, chave, obrigatória, validador, mensagem de erro)
+_REGRAS_VALIDACAO = (
+    ("modelo_ia", "nome", True, bool, "Nome do modelo não pode estar vazio"),
+    ("modelo_ia", "nome", False, _nome_modelo_valido, "Nome de modelo inválido"),
+    ("modelo_ia", "url_ollama", False, _url_ollama_valida, "URL do Ollama inválida"),
+    ("links", "limiar_similaridade", False, _intervalo_01, "Limiar deve estar entre 0.0 e 1.0"),
+    ("performance", "max_notas_cache", False, lambda v: _numero(v) and v >= 10,
+     "Mínimo de 10 notas em cache"),
+    ("rag", "limiar_relevancia", False, _intervalo_01,
+     "Limiar de relevância deve estar entre 0.0 e 1.0"),
+    ("embeddings", "quantizacao", False, lambda v: v in _MODOS_QUANTIZACAO,
+     "Quantização deve ser 'fp32' ou 'sq8'"),
+)
+
+# Regras agrupadas por (seção, chave), mantendo a ordem de _REGRAS_VALIDACAO
+_REGRAS_POR_CHAVE: Dict[tuple, tuple] = {}
+for _regra in _REGRAS_VALIDACAO:
+    _REGRAS_POR_CHAVE[_regra[:2]] = _REGRAS_POR_CHAVE.get(_regra[:2], ()) + (_regra,)
+del _regra
+
+
+def _corrigir_intervalo_01(valor: Any) -> Any:
+    """Substitui por 0.5 valores fora do intervalo [0.0, 1.0]."""
+    numero = float(valor)
+    if not 0.0 <= numero <= 1.0:
+        return 0.5
+    return valor if _numero(valor) else numero
+
+
+def _corrigir_minimo_cache(valor: Any) -> Any:
+    """Substitui por 100 tamanhos de cache inferiores a 10."""
+    numero = float(valor)
+    if numero < 10:
+        return 100
+    return valor if _numero(valor) else numero
+
+
+def _corrigir_quantizacao(valor: Any) -> Any:
+    """Rejeita modos de quantização desconhecidos (mantém o padrão)."""
+    if valor not in _MODOS_QUANTIZACAO:
+        raise ValueError(valor)
+    return valor
+
+
+# Correções aplicadas ao carregar o ficheiro; ValueError/TypeError descartam o valor
+_CORRECOES = {
+    ("links", "limiar_similaridade"): _corrigir_intervalo_01,
+    ("performance", "max_notas_cache"): _corrigir_minimo_cache,
+    ("performance", "max_embeddings_cache"): _corrigir_minimo_cache,
+    ("rag", "limiar_relevancia"): _corrigir_intervalo_01,
+    ("embeddings", "quantizacao"): _corrigir_quantizacao,
+}
+
+
+# ==============================================================================
+# Snapshots Imutáveis de Configuração
+# ==============================================================================
+
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class SnapshotLinks:
+    """
+    Cópia imutável da seção 'links', para leituras frequentes por atributo.
+
+    Attributes:
+        limiar_similaridade (float): Similaridade mínima para sugerir um link.
+        max_links_por_paragrafo (int): Número máximo de links por parágrafo.
+        aplicar_apenas_primeira_ocorrencia (bool): Vincular só a primeira ocorrência do termo.
+        modo_semantico_ativo (bool): Incluir sugestões semânticas.
+        confirmar_antes_aplicar (bool): Pedir confirmação antes de aplicar links.
+    """
+    limiar_similaridade: float = _CONFIGURACOES_PADRAO["links"]["limiar_similaridade"]
+    max_links_por_paragrafo: int = _CONFIGURACOES_PADRAO["links"]["max_links_por_paragrafo"]
+    aplicar_apenas_primeira_ocorrencia: bool = _CONFIGURACOES_PADRAO["links"]["aplicar_apenas_primeira_ocorrencia"]
+    modo_semantico_ativo: bool = _CONFIGURACOES_PADRAO["links"]["modo_semantico_ativo"]
+    confirmar_antes_aplicar: bool = _CONFIGURACOES_PADRAO["links"]["confirmar_antes_aplicar"]
+
+
+_CAMPOS_SNAPSHOT_LINKS = frozenset(f.name for f in fields(SnapshotLinks))
+
+
 class ConfiguradorSmartNote:
     """
     Gerencia configurações persistentes do SmartNote a partir de ficheiro JSON.
@@ -38,7 +312,14 @@ class ConfiguradorSmartNote:
         self.config_path = config_path
         self.config_dir = os.path.dirname(config_path)
         self._configuracoes = self._carregar_configuracoes_padrao()
+        self._cache_acessores: Dict[str, Any] = {}
+        self._stopwords_cache: Optional[FrozenSet[str]] = None
+        self._stopwords_mtime: float = -1.0
+        self._diretorio_config_existe: bool = False
         self._criar_diretorio_config()
+
+        # Conteúdo do ficheiro tal como foi lido ou gravado pela última vez
+        self._bytes_gravados: Optional[bytes] = None
         self.carregar_configuracoes()
 
     # --------------------------------------------------------------------------
@@ -47,9 +328,15 @@ class ConfiguradorSmartNote:
     def _criar_diretorio_config(self):
         """
         Cria o diretório onde as configurações serão salvas, se não existir.
+
+        Depois da primeira criação bem-sucedida, as chamadas seguintes não
+        voltam a consultar o sistema de ficheiros.
         """
-        if self.config_dir and not os.path.exists(self.config_dir):
-            os.makedirs(self.config_dir)
+        if self._diretorio_config_existe:
+            return
+        if self.config_dir:
+            os.makedirs(self.config_dir, exist_ok=True)
+        self._diretorio_config_existe = True
 
     # --------------------------------------------------------------------------
     # Funções específicas para o modelo Ollama
@@ -82,99 +369,15 @@ class ConfiguradorSmartNote:
 
     def _carregar_configuracoes_padrao(self) -> Dict[str, Any]:
         """
-        Retorna um dicionário com todas as configurações padrão do SmartNote.
+        Retorna uma cópia independente das configurações padrão do SmartNote.
 
-        As configurações abrangem desde parâmetros do modelo de IA até aspectos
-        de interface, desempenho e privacidade.
+        Basta copiar os dois níveis de dicionários, pois todos os valores são
+        imutáveis (str, int, float, bool).
 
         Returns:
             Dict[str, Any]: Estrutura com valores padrão organizados por categoria.
         """
-        return {
-            # ----------------------------------------------------------------------
-            # Configurações do modelo de IA
-            # ----------------------------------------------------------------------
-            "modelo_ia": {
-                "nome": "tinyllama",                     
-                "url_ollama": "http://localhost:11434", 
-                "timeout": 30,
-                "temperatura": 0.7,
-                "max_tokens": 1024,                    
-                "ativar_ollama": True
-            },
-
-            # ----------------------------------------------------------------------
-            # Embeddings para similaridade semântica
-            # ----------------------------------------------------------------------
-            "embeddings": {
-                "modelo": "all-MiniLM-L6-v2",             
-                "dimensoes": 384,
-                "cache_embeddings": True                  
-            },
-
-            # ----------------------------------------------------------------------
-            # Geração de links automáticos
-            # ----------------------------------------------------------------------
-            "links": {
-                "limiar_similaridade": 0.50,
-                "max_links_por_paragrafo": 3,
-                "aplicar_apenas_primeira_ocorrencia": True,
-                "modo_semantico_ativo": True,
-                "confirmar_antes_aplicar": True
-            },
-
-            # ----------------------------------------------------------------------
-            # Configurações de busca
-            # ----------------------------------------------------------------------
-            "busca": {
-                "destaque_cor": "#FFFF00",            
-                "ignorar_acentos": True,
-                "busca_semantica_ativa": True,
-                "max_resultados": 50
-            },
-
-            # ----------------------------------------------------------------------
-            # Personalização da interface
-            # ----------------------------------------------------------------------
-            "interface": {
-                "tema": "claro",
-                "fonte_tamanho": 12,
-                "fonte_familia": "Arial",
-                "texto_negrito": False,              
-                "texto_italico": False,                  
-                "mostrar_backlinks": True,
-                "auto_salvar": True,
-                "intervalo_auto_salvar": 300            
-            },
-
-            # ----------------------------------------------------------------------
-            # Desempenho e limites
-            # ----------------------------------------------------------------------
-            "performance": {
-                "max_notas_cache": 500,                    
-                "max_embeddings_cache": 2000,
-                "reindexar_automaticamente": False,
-                "threads_processamento": 1
-            },
-
-            # ----------------------------------------------------------------------
-            # Privacidade e anonimato
-            # ----------------------------------------------------------------------
-            "privacidade": {
-                "modo_offline": True,
-                "salvar_historico_pesquisa": False,
-                "logs_detalhados": False
-            },
-
-            # ----------------------------------------------------------------------
-            # RAG (Retrieval-Augmented Generation)
-            # ----------------------------------------------------------------------
-            "rag": {
-                "max_documentos_contexto": 3,
-                "limiar_relevancia": 0.35,
-                "max_caracteres_contexto": 2000
-            }
-        }
+        return {secao: dict(valores) for secao, valores in _CONFIGURACOES_PADRAO.items()}
 
 
     def carregar_configuracoes(self) -> bool:
@@ -186,52 +389,75 @@ class ConfiguradorSmartNote:
         """
         try:
             if os.path.exists(self.config_path):
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config_ficheiro = json.load(f)
+                with open(self.config_path, 'rb') as f:
+                    dados = f.read()
+                    config_ficheiro = _json_loads(dados)
+                    self._bytes_gravados = dados
 
-                    erros = self.validar_configuracoes(config_ficheiro)
+                    erros = self._aplicar_configuracoes(config_ficheiro)
                     if erros:
-                        logger.warning(f"Configurações inválidas: {erros}")
-                        config_ficheiro = self._corrigir_configuracoes(config_ficheiro)
-
-                    self._merge_configuracoes(config_ficheiro)
+                        logger.warning("Configurações inválidas: %s", erros)
                 return True
             return False
         except Exception as e:
-            logger.error(f"Erro ao carregar configurações: {e}")
+            logger.error("Erro ao carregar configurações: %s", e)
             self._configuracoes = self._carregar_configuracoes_padrao()
+            self._invalidar_cache_acessores()
             return False
 
 
-    def _corrigir_configuracoes(self, config: Dict[str, Any]) -> Dict[str, Any]:
+    def _aplicar_configuracoes(self, config_ficheiro: Dict[str, Any]) -> Dict[str, str]:
         """
-        Corrige valores inválidos em configurações numéricas com base em limites seguros.
+        Valida, corrige e mescla as configurações lidas do ficheiro numa única passagem.
+
+        Valores numéricos fora dos limites seguros são corrigidos (ver `_CORRECOES`)
+        e valores não convertíveis são descartados, mantendo o valor padrão.
 
         Args:
-            config (Dict[str, Any]): Configurações carregadas do ficheiro.
+            config_ficheiro (Dict[str, Any]): Configurações lidas do ficheiro.
 
         Returns:
-            Dict[str, Any]: Configurações corrigidas.
-        """
-        for secao, chaves in [
-            ("links", ["limiar_similaridade"]),
-            ("performance", ["max_notas_cache", "max_embeddings_cache"]),
-            ("rag", ["limiar_relevancia"])
-        ]:
-            if secao in config:
-                for chave in chaves:
-                    if chave in config[secao]:
-                        try:
-                            valor = float(config[secao][chave])
-                            if "similaridade" in chave or "relevancia" in chave:
-                                if not 0.0 <= valor <= 1.0:
-                                    config[secao][chave] = 0.5
-                            elif "cache" in chave:
-                                if valor < 10:
-                                    config[secao][chave] = 100
-                        except (TypeError, ValueError):
-                            config[secao].pop(chave, None)
-        return config
+            Dict[str, str]: Erros de validação encontrados (vazio se o nível de
+                            logging não incluir avisos).
+        """
+        reportar = logger.isEnabledFor(logging.WARNING)
+        erros = {}
+
+        self._invalidar_cache_acessores()
+        for secao, valores in config_ficheiro.items():
+            if secao not in self._configuracoes or not isinstance(valores, dict):
+                logger.warning("Seção desconhecida: %s", secao)
+                if secao == "rag":
+                    self._configuracoes[secao] = valores
+                continue
+
+            destino = self._configuracoes[secao]
+            for chave, valor in valores.items():
+                if chave not in destino:
+                    logger.warning("Chave desconhecida: %s.%s", secao, chave)
+                    continue
+
+                if reportar:
+                    for _, _, _, valido, mensagem in _REGRAS_POR_CHAVE.get((secao, chave), ()):
+                        if not valido(valor):
+                            erros[f"{secao}.{chave}"] = mensagem
+                            break
+
+                corrigir = _CORRECOES.get((secao, chave))
+                if corrigir is not None:
+                    try:
+                        valor = corrigir(valor)
+                    except (TypeError, ValueError):
+                        continue
+
+                destino[chave] = valor
+
+        if reportar:
+            for secao, chave, obrigatoria, _, mensagem in _REGRAS_VALIDACAO:
+                if obrigatoria and chave not in (config_ficheiro.get(secao) or {}):
+                    erros.setdefault(f"{secao}.{chave}", mensagem)
+
+        return erros
 
 
     def _merge_configuracoes(self, config_ficheiro: Dict[str, Any]):
@@ -241,33 +467,44 @@ class ConfiguradorSmartNote:
         Args:
             config_ficheiro (Dict[str, Any]): Configurações lidas do ficheiro.
         """
+        self._invalidar_cache_acessores()
+        configuracoes = self._configuracoes
+        avisar = logger.warning
         for secao, valores in config_ficheiro.items():
-            if secao in self._configuracoes and isinstance(valores, dict):
-                for chave, valor in valores.items():
-                    if chave in self._configuracoes[secao]:
-                        self._configuracoes[secao][chave] = valor
-                    else:
-                        logger.warning(f"Chave desconhecida: {secao}.{chave}")
-            else:
-                logger.warning(f"Seção desconhecida: {secao}")
+            destino = configuracoes.get(secao)
+            if destino is None or type(valores) is not dict:
+                avisar("Seção desconhecida: %s", secao)
                 if secao == "rag":
-                    self._configuracoes[secao] = valores
+                    configuracoes[secao] = valores
+                continue
+            for chave, valor in valores.items():
+                if chave in destino:
+                    destino[chave] = valor
+                else:
+                    avisar("Chave desconhecida: %s.%s", secao, chave)
 
 
     def salvar_configuracoes(self) -> bool:
         """
         Salva as configurações atuais no ficheiro JSON.
 
+        As configurações são sempre serializadas (inclusive alterações feitas
+        diretamente nos dicionários devolvidos por `obter`), mas o ficheiro só
+        é escrito se o conteúdo diferir do último lido ou gravado.
+
         Returns:
             bool: True se o salvamento for bem-sucedido, False caso contrário.
         """
         try:
+            dados = _json_dumps(self._configuracoes)
+            if dados == self._bytes_gravados:
+                return True
             self._criar_diretorio_config()
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self._configuracoes, f, ensure_ascii=False, indent=4)
+            _escrever_atomico(self.config_path, dados)
+            self._bytes_gravados = dados
             return True
         except Exception as e:
-            logger.error(f"Erro ao salvar configurações: {e}")
+            logger.error("Erro ao salvar configurações: %s", e)
             return False
 
 
@@ -313,18 +550,46 @@ class ConfiguradorSmartNote:
         """
         try:
             if secao not in self._configuracoes:
-                if secao not in self._carregar_configuracoes_padrao():
-                    logger.warning(f"Tentativa de criar seção desconhecida: {secao}")
+                if secao not in _SECOES_VALIDAS:
+                    logger.warning("Tentativa de criar seção desconhecida: %s", secao)
                     return False
                 self._configuracoes[secao] = {}
 
             self._configuracoes[secao][chave] = valor
+            self._invalidar_cache_acessores()
             return True
         except Exception as e:
-            logger.error(f"Erro ao definir configuração: {e}")
+            logger.error("Erro ao definir configuração: %s", e)
             return False
 
 
+    # --------------------------------------------------------------------------
+    # Memorização dos acessores obter_config_*
+    # --------------------------------------------------------------------------
+    def _invalidar_cache_acessores(self):
+        """
+        Descarta os resultados memorizados dos acessores de configuração.
+        """
+        self._cache_acessores.clear()
+
+
+    def _obter_secao_memorizada(self, secao: str) -> Dict[str, Any]:
+        """
+        Retorna uma seção de configuração, memorizando o resultado até à próxima alteração.
+
+        Args:
+            secao (str): Nome da seção.
+
+        Returns:
+            Dict[str, Any]: Configurações da seção, ou dicionário vazio.
+        """
+        try:
+            return self._cache_acessores[secao]
+        except KeyError:
+            valor = self._cache_acessores[secao] = self.obter(secao, padrao={})
+            return valor
+
+
     def obter_modelo_ia(self) -> Dict[str, Any]:
         """
         Retorna as configurações do modelo de IA.
@@ -332,7 +597,7 @@ class ConfiguradorSmartNote:
         Returns:
             Dict[str, Any]: Configurações da seção 'modelo_ia'.
         """
-        return self.obter("modelo_ia", padrao={})
+        return self._obter_secao_memorizada("modelo_ia")
 
 
     def obter_config_links(self) -> Dict[str, Any]:
@@ -342,7 +607,25 @@ class ConfiguradorSmartNote:
         Returns:
             Dict[str, Any]: Configurações da seção 'links'.
         """
-        return self.obter("links", padrao={})
+        return self._obter_secao_memorizada("links")
+
+
+    @property
+    def snapshot_links(self) -> SnapshotLinks:
+        """
+        Retorna um snapshot imutável da seção 'links', reconstruído após cada alteração.
+
+        Returns:
+            SnapshotLinks: Configurações de links acessíveis por atributo.
+        """
+        try:
+            return self._cache_acessores["snapshot_links"]
+        except KeyError:
+            config_links = self._obter_secao_memorizada("links")
+            snapshot = self._cache_acessores["snapshot_links"] = SnapshotLinks(
+                **{k: v for k, v in config_links.items() if k in _CAMPOS_SNAPSHOT_LINKS}
+            )
+            return snapshot
 
 
     def obter_config_rag(self) -> Dict[str, Any]:
@@ -352,7 +635,7 @@ class ConfiguradorSmartNote:
         Returns:
             Dict[str, Any]: Configurações da seção 'rag'.
         """
-        return self.obter("rag", padrao={})
+        return self._obter_secao_memorizada("rag")
 
 
     def obter_config_busca(self) -> Dict[str, Any]:
@@ -362,7 +645,7 @@ class ConfiguradorSmartNote:
         Returns:
             Dict[str, Any]: Configurações da seção 'busca'.
         """
-        return self.obter("busca", padrao={})
+        return self._obter_secao_memorizada("busca")
 
 
     def obter_config_interface(self) -> Dict[str, Any]:
@@ -372,7 +655,7 @@ class ConfiguradorSmartNote:
         Returns:
             Dict[str, Any]: Configurações da seção 'interface'.
         """
-        return self.obter("interface", padrao={})
+        return self._obter_secao_memorizada("interface")
 
     
     def validar_configuracoes(self, config: Optional[Dict] = None) -> Dict[str, str]:
@@ -389,32 +672,31 @@ class ConfiguradorSmartNote:
         """
         config = config or self._configuracoes
         erros = {}
-
-        modelo_ia = config.get("modelo_ia", {})
-        if not modelo_ia.get("nome"):
-            erros["modelo_ia.nome"] = "Nome do modelo não pode estar vazio"
-        elif not self.validar_nome_modelo(modelo_ia["nome"]):
-            erros["modelo_ia.nome"] = "Nome de modelo inválido"
-
-        url_ollama = modelo_ia.get("url_ollama", "")
-        if url_ollama and not self.validar_url_ollama(url_ollama):
-            erros["modelo_ia.url_ollama"] = "URL do Ollama inválida"
-
-        limiar = config.get("links", {}).get("limiar_similaridade", 0.50)
-        if not 0.0 <= limiar <= 1.0:
-            erros["links.limiar_similaridade"] = "Limiar deve estar entre 0.0 e 1.0"
-
-        max_notas = config.get("performance", {}).get("max_notas_cache", 1000)
-        if max_notas < 10:
-            erros["performance.max_notas_cache"] = "Mínimo de 10 notas em cache"
-
-        limiar_rag = config.get("rag", {}).get("limiar_relevancia", 0.3)
-        if not 0.0 <= limiar_rag <= 1.0:
-            erros["rag.limiar_relevancia"] = "Limiar de relevância deve estar entre 0.0 e 1.0"
+        secoes = {}
+
+        for secao, chave, obrigatoria, valido, mensagem in _REGRAS_VALIDACAO:
+            caminho = f"{secao}.{chave}"
+            if caminho in erros:
+                continue  # Apenas o primeiro erro de cada chave é reportado
+
+            dados_secao = secoes.get(secao)
+            if dados_secao is None:
+                dados_secao = config.get(secao, {})
+                if not isinstance(dados_secao, dict):
+                    dados_secao = {}
+                secoes[secao] = dados_secao
+
+            valor = dados_secao.get(chave, _AUSENTE)
+            if valor is _AUSENTE:
+                if obrigatoria:
+                    erros[caminho] = mensagem
+            elif not valido(valor):
+                erros[caminho] = mensagem
 
         return erros
 
     @staticmethod
+    @lru_cache(maxsize=128)
     def validar_url_ollama(url: str) -> bool:
         """
         Verifica se a URL do Ollama tem um formato válido.
@@ -425,9 +707,10 @@ class ConfiguradorSmartNote:
         Returns:
             bool: True se começar por 'http://' ou 'https://'.
         """
-        return url.startswith("http://") or url.startswith("https://")
+        return url.startswith(_PREFIXOS_URL)
 
     @staticmethod
+    @lru_cache(maxsize=128)
     def validar_nome_modelo(modelo: str) -> bool:
         """
         Verifica se o nome do modelo é válido.
@@ -438,7 +721,7 @@ class ConfiguradorSmartNote:
         Returns:
             bool: True se o nome tem pelo menos 3 caracteres e não contém '/'.
         """
-        return bool(modelo) and len(modelo) >= 3 and '/' not in modelo
+        return bool(modelo) and _RE_NOME_MODELO.fullmatch(modelo) is not None
 
 
     def obter_config_ollama(self) -> Dict[str, Any]:
@@ -448,14 +731,19 @@ class ConfiguradorSmartNote:
         Returns:
             Dict[str, Any]: Dicionário com os parâmetros usados para chamadas ao modelo.
         """
-        return {
-            "url": self.obter("modelo_ia", "url_ollama", "http://localhost:11434"),
-            "modelo": self.obter("modelo_ia", "nome", "tinyllama"),
-            "temperatura": self.obter("modelo_ia", "temperatura", 0.7),
-            "timeout": self.obter("modelo_ia", "timeout", 30),
-            "max_tokens": self.obter("modelo_ia", "max_tokens", 1024),
-            "ativado": self.obter("modelo_ia", "ativar_ollama", True)
-        }
+        config_ollama = self._cache_acessores.get("ollama")
+        if config_ollama is None:
+            config_ollama = self._cache_acessores["ollama"] = {
+                "url": self.obter("modelo_ia", "url_ollama", "http://localhost:11434"),
+                "modelo": self.obter("modelo_ia", "nome", "tinyllama"),
+                "temperatura": self.obter("modelo_ia", "temperatura", 0.7),
+                "timeout": self.obter("modelo_ia", "timeout", 30),
+                "max_tokens": self.obter("modelo_ia", "max_tokens", 1024),
+                "ativado": self.obter("modelo_ia", "ativar_ollama", True)
+            }
+
+        # Cópia superficial para que o chamador não altere o valor memorizado
+        return dict(config_ollama)
 
 
     def resetar_para_padrao(self):
@@ -463,6 +751,7 @@ class ConfiguradorSmartNote:
         Restaura todas as configurações para os valores padrão e salva no ficheiro.
         """
         self._configuracoes = self._carregar_configuracoes_padrao()
+        self._invalidar_cache_acessores()
         self.salvar_configuracoes()
 
 
@@ -477,11 +766,10 @@ class ConfiguradorSmartNote:
             bool: True se exportado com sucesso, False caso contrário.
         """
         try:
-            with open(caminho, 'w', encoding='utf-8') as f:
-                json.dump(self._configuracoes, f, ensure_ascii=False, indent=4)
+            _escrever_atomico(caminho, _json_dumps(self._configuracoes))
             return True
         except Exception as e:
-            logger.error(f"Erro ao exportar configurações: {e}")
+            logger.error("Erro ao exportar configurações: %s", e)
             return False
 
 
@@ -496,60 +784,116 @@ class ConfiguradorSmartNote:
             bool: True se a importação for válida e bem-sucedida, False caso contrário.
         """
         try:
-            with open(caminho, 'r', encoding='utf-8') as f:
-                config_importada = json.load(f)
-
-                erros = self.validar_configuracoes(config_importada)
-                if erros:
-                    logger.warning(f"Configurações importadas inválidas: {erros}")
-                    return False
-
-                self._merge_configuracoes(config_importada)
-                self.salvar_configuracoes()
-            return True
+            with open(caminho, 'rb') as f:
+                dados = f.read()
+            config_importada = _json_loads(dados)
+
+            erros = self.validar_configuracoes(config_importada)
+            if erros:
+                logger.warning("Configurações importadas inválidas: %s", erros)
+                return False
+
+            self._merge_configuracoes(config_importada)
+
+            if config_importada == self._configuracoes:
+                # Perfil completo: os bytes importados já representam o estado atual
+                if dados != self._bytes_gravados:
+                    self._criar_diretorio_config()
+                    _escrever_atomico(self.config_path, dados)
+                    self._bytes_gravados = dados
+                return True
+            return self.salvar_configuracoes()
         except Exception as e:
-            logger.error(f"Erro ao importar configurações: {e}")
+            logger.error("Erro ao importar configurações: %s", e)
             return False
 
 
-    def obter_stopwords_personalizadas(self) -> List[str]:
+    def obter_stopwords_personalizadas(self) -> FrozenSet[str]:
         """
-        Retorna a lista de stopwords personalizadas carregadas do ficheiro.
+        Retorna o conjunto de stopwords personalizadas carregadas do ficheiro.
+
+        O conteúdo é mantido em memória e só volta a ser lido quando a data de
+        modificação do ficheiro muda. O conjunto é imutável, pelo que pode ser
+        partilhado sem cópia; use `sorted()` para obter uma lista ordenada.
 
         Returns:
-            List[str]: Lista de termos, ou lista vazia em caso de erro.
+            FrozenSet[str]: Conjunto de termos, ou conjunto vazio em caso de erro.
         """
         try:
-            if os.path.exists(STOPWORDS_PATH):
-                with open(STOPWORDS_PATH, 'r', encoding='utf-8') as f:
-                    return sorted(set(json.load(f)))
-        except Exception as e:
-            logger.error(f"Erro ao carregar stopwords: {e}")
-        return []
+            mtime = os.path.getmtime(STOPWORDS_PATH)
+        except OSError:
+            return self._stopwords_cache or frozenset()
 
+        if self._stopwords_cache is None or mtime != self._stopwords_mtime:
+            try:
+                with open(STOPWORDS_PATH, 'rb') as f:
+                    self._stopwords_cache = frozenset(_json_loads(f.read()))
+                self._stopwords_mtime = mtime
+            except Exception as e:
+                logger.error("Erro ao carregar stopwords: %s", e)
+                return self._stopwords_cache or frozenset()
 
-    def salvar_stopwords_personalizadas(self, lista: List[str]) -> bool:
+        return self._stopwords_cache
+
+
+    def salvar_stopwords_personalizadas(self, lista: Iterable[str]) -> bool:
         """
-        Salva a lista de stopwords personalizadas no ficheiro correspondente.
+        Salva as stopwords personalizadas no ficheiro correspondente.
+
+        No disco são guardadas como lista JSON ordenada, para facilitar diffs.
 
         Args:
-            lista (List[str]): Lista de termos a salvar.
+            lista (Iterable[str]): Termos a salvar.
 
         Returns:
             bool: True se o salvamento for bem-sucedido, False caso contrário.
         """
         try:
             os.makedirs(os.path.dirname(STOPWORDS_PATH), exist_ok=True)
-            with open(STOPWORDS_PATH, 'w', encoding='utf-8') as f:
-                json.dump(sorted(set(lista)), f, ensure_ascii=False, indent=4)
+            stopwords = frozenset(lista)
+            _escrever_atomico(STOPWORDS_PATH, _json_dumps(sorted(stopwords)))
+
+            self._stopwords_cache = stopwords
+            self._stopwords_mtime = os.path.getmtime(STOPWORDS_PATH)
             return True
         except Exception as e:
-            logger.error(f"Erro ao salvar stopwords: {e}")
+            logger.error("Erro ao salvar stopwords: %s", e)
             return False
 
 
 # ==============================================================================
-# Instância Global
+# Instância Global (criada no primeiro acesso)
 # ==============================================================================
 
-configurador = ConfiguradorSmartNote()
+class _ConfiguradorPreguicoso:
+    """
+    Proxy que só cria o `ConfiguradorSmartNote` global no primeiro acesso a um atributo.
+
+    Evita ler e validar o ficheiro de configuração na simples importação do módulo.
+    Encaminha a leitura, escrita e remoção de atributos, mas não é uma subclasse:
+    `isinstance(configurador, ConfiguradorSmartNote)` é falso.
+    """
+
+    def _instancia(self) -> ConfiguradorSmartNote:
+        """
+        Retorna a instância real, criando-a se ainda não existir.
+
+        Returns:
+            ConfiguradorSmartNote: Configurador global.
+        """
+        real = self.__dict__.get("_real")
+        if real is None:
+            real = self.__dict__["_real"] = ConfiguradorSmartNote()
+        return real
+
+    def __getattr__(self, nome: str) -> Any:
+        return getattr(self._instancia(), nome)
+
+    def __setattr__(self, nome: str, valor: Any):
+        setattr(self._instancia(), nome, valor)
+
+    def __delattr__(self, nome: str):
+        delattr(self._instancia(), nome)
+
+
+configurador = _ConfiguradorPreguicoso()
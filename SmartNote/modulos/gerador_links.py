@@ -15,17 +15,272 @@ Descrição: Módulo responsável por gerar links literais e semânticos entre n
 
 import os
 import re
-import pickle
+import atexit
+import math
+import json
+import bisect
+import hashlib
+import heapq
 import logging
-from typing import List, Dict, Tuple, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from operator import attrgetter
+from typing import List, Dict, Tuple, Optional, Iterable
 from dataclasses import dataclass
 import numpy as np
 import faiss
 
+from modulos.configuracao import configurador, _escrever_atomico
 from modulos.similaridade import SimilaridadeUtils
 
 logger = logging.getLogger(__name__)
 
+_RE_PARAGRAFOS = re.compile(r'\n\s*\n')  # Parágrafos separados por linhas em branco
+_RE_FRASES = re.compile(r'(?<=[.!?])\s+')  # Fronteiras de frase
+_RE_ESPACOS = re.compile(r'\s+')
+_RE_PALAVRA = re.compile(r'\w+')  # Palavra inteira; um conceito assim pode ser procurado no índice de palavras
+
+# A partir deste número de notas usa-se um índice IVF-PQ (comprimido, busca sublinear)
+LIMIAR_INDICE_IVFPQ = 1024
+IVFPQ_SUBVETORES = 48      # Deve dividir a dimensão dos embeddings (384)
+IVFPQ_BITS = 8             # Bits por subvetor (reduzidos se houver poucos pontos de treino)
+NPROBE_PADRAO = 16
+
+# A partir deste número de textos, e com `performance.encode_multiprocesso`, o
+# modelo de embeddings corre num pool de processos
+LIMIAR_ENCODE_MULTIPROCESSO = 1000
+
+MAX_CACHE_TERMO_SIMILAR = 2048  # Entradas (texto, termo, tolerância) guardadas em LRU
+MAX_CACHE_CONCEITOS_NOTAS = 512  # Notas com termos e embeddings de conceitos guardados em LRU
+
+# A partir deste número de termos na nota atual, os pares semelhantes são obtidos
+# com uma busca por raio num índice FAISS dos seus termos, em vez da matriz completa
+LIMIAR_INDICE_CONCEITOS = 256
+
+QUANTIZACAO_PADRAO = "fp32"  # "fp32" (exato) ou "sq8" (int8, 4x menos memória)
+
+
+# ==============================================================================
+# Correspondência Literal de Conceitos
+# ==============================================================================
+
+try:
+    import ahocorasick
+    AHOCORASICK_DISPONIVEL = True
+except ImportError:
+    AHOCORASICK_DISPONIVEL = False
+
+
+def _e_caractere_palavra(c: str) -> bool:
+    """Equivalente a `\\w` do módulo re para um único caractere."""
+    return c.isalnum() or c == '_'
+
+
+def _e_fronteira_palavra(texto: str, posicao: int) -> bool:
+    """
+    Indica se há uma fronteira de palavra (`\\b`) antes da posição dada.
+
+    Args:
+        texto (str): Texto analisado.
+        posicao (int): Posição entre dois caracteres (0 a len(texto)).
+
+    Returns:
+        bool: True se exatamente um dos lados for caractere de palavra.
+    """
+    antes = posicao > 0 and _e_caractere_palavra(texto[posicao - 1])
+    depois = posicao < len(texto) and _e_caractere_palavra(texto[posicao])
+    return antes != depois
+
+
+def _indexar_palavras(paragrafos: List[str]) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Constrói um índice com a primeira ocorrência de cada palavra nos parágrafos.
+
+    Uma palavra delimitada por `\\b` é exatamente um token `\\w+`, por isso um
+    conceito de uma só palavra pode ser localizado com uma consulta ao índice.
+
+    Args:
+        paragrafos (List[str]): Parágrafos do texto, pela ordem original.
+
+    Returns:
+        Dict[str, Tuple[int, int, int]]: Para cada palavra (em minúsculas), o
+        índice do parágrafo e as posições inicial e final da primeira ocorrência.
+    """
+    indice: Dict[str, Tuple[int, int, int]] = {}
+    for i, paragrafo in enumerate(paragrafos):
+        for match in _RE_PALAVRA.finditer(paragrafo):
+            indice.setdefault(match.group().lower(), (i, match.start(), match.end()))
+    return indice
+
+
+def _localizar_conceitos_automato(conceitos: frozenset, paragrafos: List[str],
+                                  paragrafos_minusculos: List[str]) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Localiza conceitos com um autómato Aho-Corasick, numa única passagem por parágrafo.
+
+    O custo de cada parágrafo é proporcional ao seu tamanho e ao número de
+    ocorrências, independentemente do número de conceitos. As fronteiras de
+    palavra são verificadas manualmente com a mesma semântica de `\\b`.
+
+    Args:
+        conceitos (frozenset): Conceitos a procurar.
+        paragrafos (List[str]): Parágrafos do texto, pela ordem original.
+        paragrafos_minusculos (List[str]): Os mesmos parágrafos em minúsculas,
+            com o mesmo comprimento que os originais.
+
+    Returns:
+        Dict[str, Tuple[int, int, int]]: Para cada conceito encontrado, o índice
+        do parágrafo e as posições inicial e final dentro dele.
+    """
+    automato = ahocorasick.Automaton()
+    por_minusculas: Dict[str, List[str]] = {}
+    for conceito in conceitos:
+        por_minusculas.setdefault(conceito.lower(), []).append(conceito)
+    for minusculo, lista in por_minusculas.items():
+        automato.add_word(minusculo, (len(minusculo), lista))
+    automato.make_automaton()
+
+    encontrados: Dict[str, Tuple[int, int, int]] = {}
+    for i, (paragrafo, minusculo) in enumerate(zip(paragrafos, paragrafos_minusculos)):
+        primeiros: Dict[str, Tuple[int, int]] = {}
+        for ultimo, (tamanho, lista) in automato.iter(minusculo):
+            inicio, fim = ultimo - tamanho + 1, ultimo + 1
+            if not (_e_fronteira_palavra(paragrafo, inicio) and _e_fronteira_palavra(paragrafo, fim)):
+                continue
+            for conceito in lista:
+                if conceito not in encontrados and (conceito not in primeiros or inicio < primeiros[conceito][0]):
+                    primeiros[conceito] = (inicio, fim)
+        for conceito, (inicio, fim) in primeiros.items():
+            encontrados[conceito] = (i, inicio, fim)
+        if len(encontrados) == len(conceitos):
+            break
+
+    return encontrados
+
+
+@lru_cache(maxsize=256)
+def _compilar_padrao_conceitos(conceitos: frozenset) -> Tuple[Optional[re.Pattern], Tuple[str, ...]]:
+    """
+    Compila uma única expressão regular que procura vários conceitos de uma vez.
+
+    A alternância fica dentro de um lookahead para que cada posição do texto
+    seja testada, mesmo quando dois conceitos se sobrepõem. Conceitos que são
+    prefixo de outro poderiam ficar escondidos pelo mais longo na mesma
+    posição, por isso são devolvidos à parte para serem procurados
+    individualmente.
+
+    Args:
+        conceitos (frozenset): Conceitos a procurar.
+
+    Returns:
+        Tuple[Optional[re.Pattern], Tuple[str, ...]]: Padrão combinado (ou None)
+        e conceitos que precisam de procura individual.
+    """
+    ordenados = sorted(conceitos, key=lambda c: (-len(c), c))
+    minusculos = [c.lower() for c in ordenados]
+    combinados, individuais = [], []
+    for i, conceito in enumerate(ordenados):
+        if any(outro != minusculos[i] and outro.startswith(minusculos[i]) for outro in minusculos[:i]):
+            individuais.append(conceito)
+        else:
+            combinados.append(conceito)
+
+    if not combinados:
+        return None, tuple(individuais)
+    padrao = re.compile(
+        r'(?=\b(' + '|'.join(map(re.escape, combinados)) + r')\b)', re.IGNORECASE
+    )
+    return padrao, tuple(individuais)
+
+
+@lru_cache(maxsize=1024)
+def _compilar_padrao_conceito(conceito: str) -> re.Pattern:
+    """
+    Compila (com cache) o padrão de palavra inteira para um único conceito.
+
+    Args:
+        conceito (str): Conceito a procurar.
+
+    Returns:
+        re.Pattern: Padrão compilado, insensível a maiúsculas.
+    """
+    return re.compile(rf'\b{re.escape(conceito)}\b', re.IGNORECASE)
+
+
+def _localizar_conceitos(conceitos: Iterable[str], paragrafos: List[str]) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Localiza a primeira ocorrência literal de cada conceito nos parágrafos.
+
+    Conceitos de uma só palavra são consultados num índice de palavras. Para
+    os restantes, percorre os parágrafos uma única vez, em vez de uma vez por
+    conceito: com um autómato Aho-Corasick quando `pyahocorasick` está
+    instalado, ou com um padrão regex combinado caso contrário.
+
+    Args:
+        conceitos (Iterable[str]): Conceitos a procurar.
+        paragrafos (List[str]): Parágrafos do texto, pela ordem original.
+
+    Returns:
+        Dict[str, Tuple[int, int, int]]: Para cada conceito encontrado, o índice
+        do parágrafo e as posições inicial e final dentro dele.
+    """
+    conceitos = frozenset(conceitos)
+    if not conceitos:
+        return {}
+
+    encontrados: Dict[str, Tuple[int, int, int]] = {}
+    palavras = frozenset(c for c in conceitos if _RE_PALAVRA.fullmatch(c))
+    if palavras:
+        indice_palavras = _indexar_palavras(paragrafos)
+        for conceito in palavras:
+            posicao = indice_palavras.get(conceito.lower())
+            if posicao is not None:
+                encontrados[conceito] = posicao
+        conceitos -= palavras
+        if not conceitos:
+            return encontrados
+
+    if AHOCORASICK_DISPONIVEL:
+        # As posições em minúsculas só coincidem se lower() preservar o comprimento
+        minusculos = [p.lower() for p in paragrafos]
+        if all(len(m) == len(p) for m, p in zip(minusculos, paragrafos)):
+            encontrados.update(_localizar_conceitos_automato(conceitos, paragrafos, minusculos))
+            return encontrados
+
+    padrao, individuais = _compilar_padrao_conceitos(conceitos)
+    por_minusculas: Dict[str, List[str]] = {}
+    for conceito in conceitos:
+        if conceito not in individuais:
+            por_minusculas.setdefault(conceito.lower(), []).append(conceito)
+
+    pendentes = len(conceitos) - len(individuais)
+    if padrao is not None:
+        for i, paragrafo in enumerate(paragrafos):
+            for match in padrao.finditer(paragrafo):
+                inicio = match.start(1)
+                fim = match.end(1)
+                for conceito in por_minusculas.get(match.group(1).lower(), ()):
+                    if conceito not in encontrados:
+                        encontrados[conceito] = (i, inicio, fim)
+                        pendentes -= 1
+            if pendentes <= 0:
+                break
+
+    # Conceitos escondidos por outros ou com variações de maiúsculas não mapeadas
+    for conceito in conceitos:
+        if conceito in encontrados:
+            continue
+        conceito_min = conceito.lower()
+        padrao_individual = _compilar_padrao_conceito(conceito)
+        for i, paragrafo in enumerate(paragrafos):
+            if conceito_min in paragrafo.lower():
+                match = padrao_individual.search(paragrafo)
+                if match:
+                    encontrados[conceito] = (i, match.start(), match.end())
+                    break
+
+    return encontrados
+
 
 # ==============================================================================
 # Tentativa de importar dependências avançadas (modelo de linguagem)
@@ -64,6 +319,9 @@ class LinkSugerido:
     contexto: str
     tipo: str = "semantico"
 
+
+_score_sugestao = attrgetter('score_similaridade')  # Chave de ordenação por score
+
 # ==============================================================================
 # Classe Principal: GeradorLinksAvancado
 # ==============================================================================
@@ -84,13 +342,24 @@ class GeradorLinksAvancado:
         self.indice_faiss = None                             # Índice de busca FAISS
         self.mapeamento_notas = {}                           # Mapeamento: ID -> Nota
         self.embeddings_cache = {}                           # Cache local de embeddings
+        self.embeddings_matriz = None                        # Embeddings normalizados das notas indexadas
+        self._escala_embeddings = None                       # Escala da matriz em cache, se guardada com precisão reduzida
+        self.indice_por_titulo = {}                          # Mapeamento: título -> ID no índice
+        self._pool_encode = None                             # Pool de processos do modelo (opcional)
+        self._usar_gpu = getattr(faiss, "get_num_gpus", lambda: 0)() > 0  # FAISS compilado com CUDA e GPU presente
+        self._recursos_gpu = None                            # StandardGpuResources partilhados pelos índices
         self.limiar_similaridade = 0.50                      # Valor mínimo para considerar duas notas similares
         self.max_links_por_paragrafo = 3                     # Limite de links por parágrafo
         self.modelo_nome = "sentence-transformers/multi-qa-MiniLM-L6-cos-v1"
         self.dimensao_embeddings = 384                       # Dimensão do vetor de embedding
-        self.cache_path = "cache_embeddings.pkl"             # Caminho para ficheiro de cache
-        self.cache_similaridade_termos = {}                  # Cache de similaridade entre termos
-        self.stopwords_personalizadas = set()                # Stopwords definidas dinamicamente
+        self.cache_path = "cache_embeddings.npy"             # Caminho para ficheiro de cache (matriz .npy)
+        self.stopwords_personalizadas = frozenset()          # Stopwords definidas dinamicamente
+        self.nprobe = NPROBE_PADRAO                          # Células IVF visitadas por busca
+        self._cache_candidatos: Dict[bytes, Tuple[List[Tuple[str, str]], np.ndarray]] = {}  # Candidatos por texto
+        self._cache_termo_similar: OrderedDict = OrderedDict()  # LRU de encontrar_termo_similar_no_texto
+        self._hash_ultimo_conteudo = None                    # Conteúdo da última nota processada
+        self._cache_conceitos_notas: OrderedDict = OrderedDict()  # LRU: conteúdo -> (termos, embeddings)
+        self._indice_conceitos = None                        # (embeddings, índice) dos termos da nota atual
 
     # ==============================================================================
     # Função: encontrar_termo_similar_no_texto
@@ -107,7 +376,8 @@ class GeradorLinksAvancado:
 
         Utiliza embeddings para comparar o termo com candidatos extraídos de frases do texto.
         Retorna a melhor correspondência com contexto e posição, se satisfizer o limiar
-        de similaridade especificado.
+        de similaridade especificado. Os resultados ficam numa cache LRU indexada por
+        (texto, termo, tolerância); as buscas que falham com erro não são guardadas.
 
         Args:
             texto (str): Texto onde será feita a busca.
@@ -126,50 +396,121 @@ class GeradorLinksAvancado:
         if not self.modelo_embeddings or not termo or len(termo) < 3:
             return None
 
+        chave = (hash(texto), termo, round(tolerancia, 2))
+        cache = self._cache_termo_similar
+        if chave in cache:
+            cache.move_to_end(chave)
+            return cache[chave]
+
         try:
-            # Divide o texto em frases com base em pontuação
-            frases = re.split(r'(?<=[.!?])\s+', texto)
-            candidatos = []
+            resultado = self._procurar_termo_similar(texto, termo, tolerancia)
+        except Exception as e:
+            logger.warning("Erro ao buscar termo similar: %s", e)
+            return None
 
-            # Utiliza NLP para identificar chunks nominais em cada frase
-            for frase in frases:
-                doc = self.nlp(frase)
-                for chunk in doc.noun_chunks:
-                    if len(chunk.text.strip()) > 2:
-                        candidatos.append((chunk.text.strip(), frase.strip()))
+        cache[chave] = resultado
+        if len(cache) > MAX_CACHE_TERMO_SIMILAR:
+            cache.popitem(last=False)
+        return resultado
 
-            if not candidatos:
-                return None
+    def _procurar_termo_similar(
+        self,
+        texto: str,
+        termo: str,
+        tolerancia: float
+    ) -> Optional[Tuple[str, int, int, str]]:
+        """
+        Implementa `encontrar_termo_similar_no_texto`, sem cache de resultados.
 
-            # Prepara termos candidatos e gera embeddings
-            termos_candidatos = [c[0] for c in candidatos]
-            emb_termo = self.modelo_embeddings.encode([termo])
-            emb_candidatos = self.modelo_embeddings.encode(termos_candidatos)
+        Os erros são propagados, para que o chamador não os guarde em cache.
 
-            # Compara cada embedding com o termo original
-            melhores = []
-            for i, emb in enumerate(emb_candidatos):
-                score = SimilaridadeUtils.similaridade(emb, emb_termo[0])
-                if tolerancia <= score < 0.98:
-                    melhores.append((termos_candidatos[i], candidatos[i][1], score))
+        Args:
+            texto (str): Texto onde será feita a busca.
+            termo (str): Termo original a ser procurado semanticamente.
+            tolerancia (float): Limiar mínimo de similaridade para considerar um termo válido.
 
-            if not melhores:
-                return None
+        Returns:
+            Optional[Tuple[str, int, int, str]]: Termo encontrado, posições e contexto, ou None.
+        """
+        candidatos, emb_candidatos = self._obter_candidatos_do_texto(texto)
+        if not candidatos:
+            return None
 
-            # Ordena os candidatos por maior similaridade
-            melhor_termo, contexto, _ = sorted(melhores, key=lambda x: -x[2])[0]
+        # Apenas o termo muda entre chamadas para o mesmo texto
+        emb_termo = np.asarray(
+            self.modelo_embeddings.encode([termo], convert_to_numpy=True, normalize_embeddings=True),
+            dtype=np.float32
+        )[0]
 
-            # Localiza posição do termo encontrado no texto original
-            match = re.search(rf'\b{re.escape(melhor_termo)}\b', texto, re.IGNORECASE)
-            if not match:
-                return None
+        # Similaridade do cosseno de todos os candidatos com o termo original
+        scores = np.round(SimilaridadeUtils.similaridade_matriz(emb_candidatos, emb_termo), 4)
+        validos = (scores >= tolerancia) & (scores < 0.98)
+        if not validos.any():
+            return None
 
-            return melhor_termo, match.start(), match.end(), contexto
+        # Escolhe o candidato com maior similaridade (o primeiro, em caso de empate)
+        melhor = int(np.argmax(np.where(validos, scores, -np.inf)))
+        melhor_termo, contexto = candidatos[melhor]
 
-        except Exception as e:
-            logger.warning(f"Erro ao buscar termo similar: {e}")
+        # Localiza posição do termo encontrado no texto original
+        match = _compilar_padrao_conceito(melhor_termo).search(texto)
+        if not match:
             return None
+
+        return melhor_termo, match.start(), match.end(), contexto
      
+    def _obter_candidatos_do_texto(self, texto: str) -> Tuple[List[Tuple[str, str]], np.ndarray]:
+        """
+        Extrai os chunks nominais candidatos de um texto e os seus embeddings normalizados.
+
+        Os chunks nominais vêm do modelo spaCy do extrator de conceitos; sem ele
+        não há candidatos. O resultado é guardado em cache pelo hash do texto,
+        pois a mesma nota é consultada uma vez por conceito sem correspondência literal.
+
+        Args:
+            texto (str): Texto de onde extrair os candidatos.
+
+        Returns:
+            Tuple[List[Tuple[str, str]], np.ndarray]: Pares (candidato, frase) e a
+            matriz float32 com os embeddings normalizados de cada candidato.
+        """
+        chave = hashlib.md5(texto.encode()).digest()
+        em_cache = self._cache_candidatos.get(chave)
+        if em_cache is not None:
+            return em_cache
+
+        from modulos.conceitos import extrator_conceitos
+
+        nlp = extrator_conceitos.nlp
+        if nlp is None:
+            return [], np.empty((0, self.dimensao_embeddings), dtype=np.float32)
+
+        # Divide o texto em frases com base em pontuação
+        frases = _RE_FRASES.split(texto)
+        candidatos = []
+
+        # Utiliza NLP para identificar chunks nominais em cada frase
+        for frase, doc in zip(frases, nlp.pipe(frases)):
+            for chunk in doc.noun_chunks:
+                if len(chunk.text.strip()) > 2:
+                    candidatos.append((chunk.text.strip(), frase.strip()))
+
+        if candidatos:
+            emb_candidatos = np.asarray(
+                self.modelo_embeddings.encode(
+                    [c[0] for c in candidatos],
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    batch_size=64
+                ),
+                dtype=np.float32
+            )
+        else:
+            emb_candidatos = np.empty((0, self.dimensao_embeddings), dtype=np.float32)
+
+        resultado = self._cache_candidatos[chave] = (candidatos, emb_candidatos)
+        return resultado
+
     # ==============================================================================
     # Inicialização do modelo e criação do índice FAISS
     # ==============================================================================
@@ -187,12 +528,12 @@ class GeradorLinksAvancado:
 
         try:
             if self.modelo_embeddings is None:
-                logger.info(f"Carregando modelo {self.modelo_nome}...")
+                logger.info("Carregando modelo %s...", self.modelo_nome)
                 self.modelo_embeddings = SentenceTransformer(self.modelo_nome)
                 logger.info("Modelo carregado com sucesso!")
             return True
         except Exception as e:
-            logger.error(f"Erro ao carregar modelo: {e}")
+            logger.error("Erro ao carregar modelo: %s", e)
             return False
 
     def criar_indice_faiss(self, notas: List[Dict]) -> bool:
@@ -220,74 +561,349 @@ class GeradorLinksAvancado:
                 textos.append(texto)
                 self.mapeamento_notas[i] = nota
 
-            # Geração dos embeddings para todos os textos
-            embeddings = self.modelo_embeddings.encode(textos, show_progress_bar=True)
-            embeddings = np.array(embeddings).astype('float32')
+            # Geração dos embeddings, já normalizados (similaridade cosseno)
+            embeddings = self._codificar_textos_notas(textos)
 
-            # Normaliza os vetores e cria índice FAISS (similaridade cosseno)
-            faiss.normalize_L2(embeddings)
-            self.indice_faiss = faiss.IndexFlatIP(self.dimensao_embeddings)
-            self.indice_faiss.add(embeddings)
+            # Cria índice FAISS
+            self.indice_faiss = self._construir_indice(embeddings)
+            self._registar_embeddings(embeddings)
 
             # Salva dados em cache
             self._salvar_cache(embeddings, notas)
 
-            logger.info(f"Índice FAISS criado com {len(notas)} notas")
+            logger.info("Índice FAISS criado com %d notas", len(notas))
             return True
 
         except Exception as e:
-            logger.info(f"Erro ao criar índice FAISS: {e}")
+            logger.info("Erro ao criar índice FAISS: %s", e)
             return False
 
+    def _quantizacao(self) -> str:
+        """
+        Retorna o modo de quantização configurado em `embeddings.quantizacao`.
+
+        Returns:
+            str: "fp32" ou "sq8".
+        """
+        modo = configurador.obter("embeddings", "quantizacao", QUANTIZACAO_PADRAO)
+        return modo if modo in ("fp32", "sq8") else QUANTIZACAO_PADRAO
+
+    def _codificar_textos_notas(self, textos: List[str]) -> np.ndarray:
+        """
+        Gera os embeddings normalizados de muitos textos de notas.
+
+        Para coleções grandes, e se `performance.encode_multiprocesso` estiver
+        ativo, distribui o trabalho por um pool de processos do SentenceTransformer.
+
+        Args:
+            textos (List[str]): Textos a codificar.
+
+        Returns:
+            np.ndarray: Matriz float32 contígua com uma linha normalizada por texto.
+        """
+        if (len(textos) >= LIMIAR_ENCODE_MULTIPROCESSO
+                and configurador.obter("performance", "encode_multiprocesso", False)):
+            if self._pool_encode is None:
+                self._pool_encode = self.modelo_embeddings.start_multi_process_pool()
+                atexit.register(self.encerrar_pool_encode)
+            embeddings = self.modelo_embeddings.encode_multi_process(textos, self._pool_encode, batch_size=32)
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+            faiss.normalize_L2(embeddings)
+            return embeddings
+
+        embeddings = self.modelo_embeddings.encode(
+            textos,
+            batch_size=64,
+            show_progress_bar=True,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        return np.ascontiguousarray(embeddings, dtype=np.float32)  # Sem cópia se já for float32
+
+    def encerrar_pool_encode(self):
+        """
+        Termina o pool de processos do modelo de embeddings, se existir.
+        """
+        if self._pool_encode is not None:
+            try:
+                self.modelo_embeddings.stop_multi_process_pool(self._pool_encode)
+            except Exception as e:
+                logger.info("Erro ao terminar pool de embeddings: %s", e)
+            self._pool_encode = None
+
+    def _registar_embeddings(self, embeddings: np.ndarray, escala: Optional[float] = None):
+        """
+        Guarda os embeddings indexados e o ID de cada nota pelo título.
+
+        Permite reutilizar o embedding de uma nota já indexada em vez de a
+        voltar a codificar com o modelo.
+
+        Args:
+            embeddings (np.ndarray): Matriz normalizada, alinhada com `mapeamento_notas`.
+                Pode ser a matriz float16/int8 do cache, mapeada em memória.
+            escala (Optional[float]): Escala da matriz de precisão reduzida; None
+                se `embeddings` já estiver em float32.
+        """
+        self.embeddings_matriz = embeddings
+        self._escala_embeddings = escala
+        self.indice_por_titulo = {}
+        for i, nota in self.mapeamento_notas.items():
+            self.indice_por_titulo.setdefault(nota['titulo'], i)
+
+    def _embedding_indexado(self, nota: Dict) -> Optional[np.ndarray]:
+        """
+        Retorna o embedding já indexado de uma nota, se o conteúdo não mudou.
+
+        Args:
+            nota (Dict): Nota com 'titulo' e 'conteudo'.
+
+        Returns:
+            Optional[np.ndarray]: Vetor normalizado, ou None se a nota tiver de ser codificada.
+        """
+        if self.embeddings_matriz is None:
+            return None
+        idx = self.indice_por_titulo.get(nota['titulo'])
+        if idx is None or self.mapeamento_notas[idx]['conteudo'] != nota['conteudo']:
+            return None
+        if self._escala_embeddings is None:
+            return self.embeddings_matriz[idx]
+
+        # Linha do cache em precisão reduzida: converte só esta e renormaliza
+        vetor = self.embeddings_matriz[idx].astype(np.float32) * np.float32(self._escala_embeddings)
+        norma = np.linalg.norm(vetor)
+        return vetor / norma if norma > 0 else vetor
+
+    def _construir_indice(self, embeddings: np.ndarray):
+        """
+        Constrói o índice FAISS de produto interno para embeddings normalizados.
+
+        Para coleções grandes usa IVF-PQ: os vetores são comprimidos em códigos
+        de `IVFPQ_SUBVETORES` bytes e cada busca visita apenas `nprobe` células.
+        Caso contrário usa um índice exato; com `embeddings.quantizacao = "sq8"`
+        os vetores são guardados no índice com 8 bits por dimensão.
+
+        Args:
+            embeddings (np.ndarray): Matriz float32 contígua, com linhas normalizadas (L2).
+
+        Returns:
+            faiss.Index: Índice com os embeddings adicionados.
+        """
+        d = self.dimensao_embeddings
+        if len(embeddings) >= LIMIAR_INDICE_IVFPQ and d % IVFPQ_SUBVETORES == 0:
+            nlist = max(4, int(math.sqrt(len(embeddings))))
+            # O k-means do PQ pede ~39 pontos por centróide (2**bits centróides)
+            bits = max(4, min(IVFPQ_BITS, int(math.log2(len(embeddings) / 39))))
+            quantizador = faiss.IndexFlatIP(d)
+            indice = faiss.IndexIVFPQ(
+                quantizador, d, nlist, IVFPQ_SUBVETORES, bits, faiss.METRIC_INNER_PRODUCT
+            )
+            indice.nprobe = min(nlist, self.nprobe)
+        elif self._quantizacao() == "sq8":
+            indice = faiss.IndexScalarQuantizer(d, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+        else:
+            indice = faiss.IndexFlatIP(d)
+
+        if not indice.is_trained:
+            indice.train(embeddings)
+        indice.add(embeddings)
+        return self._mover_para_gpu(indice)
+
+    def _mover_para_gpu(self, indice):
+        """
+        Copia o índice para a GPU, quando existe uma disponível.
+
+        Se a cópia falhar (memória insuficiente ou tipo de índice não suportado),
+        o índice continua na CPU e as tentativas seguintes são desativadas.
+
+        Args:
+            indice (faiss.Index): Índice construído na CPU.
+
+        Returns:
+            faiss.Index: Índice na GPU, ou o original se não for possível movê-lo.
+        """
+        if not self._usar_gpu:
+            return indice
+        try:
+            if self._recursos_gpu is None:
+                self._recursos_gpu = faiss.StandardGpuResources()
+            return faiss.index_cpu_to_gpu(self._recursos_gpu, 0, indice)
+        except Exception as e:
+            logger.warning("Não foi possível mover o índice FAISS para a GPU, usando CPU: %s", e)
+            self._usar_gpu = False
+            return indice
+
     # ==============================================================================
     # Cache: Salvar Embeddings
     # ==============================================================================
 
+    def _caminho_metadados_cache(self) -> str:
+        """
+        Retorna o caminho do ficheiro JSON com os metadados do cache de embeddings.
+
+        Returns:
+            str: Caminho do ficheiro de metadados, ao lado da matriz .npy.
+        """
+        return os.path.splitext(self.cache_path)[0] + ".json"
+
+    def _caminho_indice_cache(self) -> str:
+        """
+        Retorna o caminho do ficheiro com o índice FAISS serializado.
+
+        Returns:
+            str: Caminho do ficheiro .faiss, ao lado da matriz .npy.
+        """
+        return os.path.splitext(self.cache_path)[0] + ".faiss"
+
+    def _salvar_indice(self):
+        """
+        Serializa o índice FAISS atual com `faiss.write_index`.
+
+        Guardar o índice já construído (e, no IVF-PQ, já treinado) evita
+        repetir o treino e a inserção dos vetores no próximo arranque. O
+        ficheiro é escrito à parte e depois substituído, porque o índice
+        anterior pode estar mapeado em memória; se a escrita falhar, é
+        removido para não ficar um índice obsoleto.
+        """
+        caminho = self._caminho_indice_cache()
+        temporario = caminho + ".tmp"
+        try:
+            indice = self.indice_faiss
+            if self._recursos_gpu is not None:
+                indice = faiss.index_gpu_to_cpu(indice)
+            faiss.write_index(indice, temporario)
+            os.replace(temporario, caminho)
+        except Exception as e:
+            logger.info("Erro ao salvar índice FAISS: %s", e)
+            for ficheiro in (temporario, caminho):
+                try:
+                    os.remove(ficheiro)
+                except OSError:
+                    pass
+
+    def _carregar_indice(self, n_vetores: int):
+        """
+        Lê o índice FAISS serializado, mapeando o ficheiro em memória quando possível.
+
+        Args:
+            n_vetores (int): Número de vetores que o índice deve conter.
+
+        Returns:
+            Optional[faiss.Index]: Índice lido, ou None se não existir ou não
+            corresponder ao cache de embeddings.
+        """
+        caminho = self._caminho_indice_cache()
+        if not os.path.exists(caminho):
+            return None
+        try:
+            try:
+                indice = faiss.read_index(caminho, faiss.IO_FLAG_MMAP)
+            except RuntimeError:
+                # Nem todos os tipos de índice suportam mmap
+                indice = faiss.read_index(caminho)
+        except Exception as e:
+            logger.info("Erro ao ler índice FAISS: %s", e)
+            return None
+
+        if indice.ntotal != n_vetores or indice.d != self.dimensao_embeddings:
+            return None
+        if hasattr(indice, 'nprobe'):
+            indice.nprobe = min(indice.nlist, self.nprobe)
+        return self._mover_para_gpu(indice)
+
     def _salvar_cache(self, embeddings: np.ndarray, notas: List[Dict]):
         """
         Salva os embeddings e metadados em ficheiro de cache local.
 
+        Os embeddings são guardados numa matriz .npy em float16 (ou int8 com
+        `embeddings.quantizacao = "sq8"`), reduzindo a leitura do disco para
+        metade (ou um quarto); no carregamento voltam a float32. Os metadados
+        ficam num JSON ao lado, com o título da nota correspondente a cada
+        linha e a escala de quantização. Todos os ficheiros são escritos de
+        forma atómica, e os metadados por último.
+
         Args:
             embeddings (np.ndarray): Vetores gerados para cada nota.
             notas (List[Dict]): Lista de dicionários com as notas originais.
         """
         try:
-            cache_data = {
-                'embeddings': embeddings,
-                'mapeamento_notas': self.mapeamento_notas,
-                'notas_hash': self._calcular_hash_notas(notas)
+            matriz = np.ascontiguousarray(embeddings, dtype=np.float32)
+            escala = None
+            if self._quantizacao() == "sq8":
+                escala = float(np.abs(matriz).max(initial=0.0)) / 127 or 1.0
+                matriz = np.round(matriz / escala).astype(np.int8)
+            else:
+                matriz = matriz.astype(np.float16)
+            _escrever_atomico(self.cache_path, lambda f: np.save(f, matriz))
+            metadados = {
+                'notas_hash': self._calcular_hash_notas(notas),
+                'titulos': [self.mapeamento_notas[i]['titulo'] for i in range(len(self.mapeamento_notas))],
+                'escala': escala,
+                'quantizacao': self._quantizacao()
             }
-            with open(self.cache_path, 'wb') as f:
-                pickle.dump(cache_data, f)
+            self._salvar_indice()
+            dados = json.dumps(metadados, ensure_ascii=False).encode('utf-8')
+            _escrever_atomico(self._caminho_metadados_cache(), dados)
         except Exception as e:
-            logger.info(f"Erro ao salvar cache: {e}")
+            logger.info("Erro ao salvar cache: %s", e)
 
     def _carregar_cache(self, notas: List[Dict]) -> bool:
         """Carrega cache de embeddings se válido."""
         try:
-            if not os.path.exists(self.cache_path):
+            caminho_metadados = self._caminho_metadados_cache()
+            if not os.path.exists(self.cache_path) or not os.path.exists(caminho_metadados):
                 return False
             
-            with open(self.cache_path, 'rb') as f:
-                cache_data = pickle.load(f)
+            with open(caminho_metadados, 'r', encoding='utf-8') as f:
+                metadados = json.load(f)
             
             # Verificar se cache é válido
-            if cache_data['notas_hash'] != self._calcular_hash_notas(notas):
+            if metadados['notas_hash'] != self._calcular_hash_notas(notas):
                 return False
             
-            # Restaurar dados
-            embeddings = cache_data['embeddings']
-            self.mapeamento_notas = cache_data['mapeamento_notas']
+            # Restaurar o mapeamento linha -> nota pelos títulos guardados
+            notas_por_titulo: Dict[str, List[Dict]] = {}
+            for nota in notas:
+                notas_por_titulo.setdefault(nota['titulo'], []).append(nota)
+            mapeamento = {}
+            for i, titulo in enumerate(metadados['titulos']):
+                candidatas = notas_por_titulo.get(titulo)
+                if not candidatas:
+                    return False
+                mapeamento[i] = candidatas.pop(0)
+
+            # Mapeia a matriz em memória; as páginas só são lidas quando usadas
+            embeddings = np.load(self.cache_path, mmap_mode='r')
+            if embeddings.shape != (len(mapeamento), self.dimensao_embeddings):
+                return False
+            escala = None
+            if embeddings.dtype in (np.int8, np.float16):
+                escala = metadados['escala'] if embeddings.dtype == np.int8 else 1.0
+            elif embeddings.dtype != np.float32:
+                return False
             
-            # Recriar índice FAISS
-            self.indice_faiss = faiss.IndexFlatIP(self.dimensao_embeddings)
-            self.indice_faiss.add(embeddings)
+            # Reutiliza o índice serializado; só o reconstrói se faltar ou não corresponder
+            indice = None
+            if metadados.get('quantizacao') == self._quantizacao():
+                indice = self._carregar_indice(len(mapeamento))
+            if indice is None:
+                vetores = embeddings
+                if escala is not None:
+                    # Precisão reduzida: volta a float32 (int8 com a escala guardada)
+                    # e renormaliza para compensar o arredondamento
+                    vetores = embeddings.astype(np.float32) * np.float32(escala)
+                    faiss.normalize_L2(vetores)
+                indice = self._construir_indice(vetores)
+                embeddings, escala = vetores, None
+            self.mapeamento_notas = mapeamento
+            self.indice_faiss = indice
+            # Com o índice lido do disco, a matriz fica mapeada sem cópia para float32
+            self._registar_embeddings(embeddings, escala)
             
             logger.info("Cache de embeddings carregado com sucesso")
             return True
             
         except Exception as e:
-            logger.info(f"Erro ao carregar cache: {e}")
+            logger.info("Erro ao carregar cache: %s", e)
             return False
     
     # ==============================================================================
@@ -296,10 +912,11 @@ class GeradorLinksAvancado:
 
     def _calcular_hash_notas(self, notas: List[Dict]) -> str:
         """
-        Calcula um hash MD5 baseado no conteúdo das notas.
+        Calcula um hash BLAKE2b baseado no conteúdo das notas.
 
         Utilizado para validar se o cache atual ainda é válido ao comparar
-        o conteúdo atual com o conteúdo previamente cacheado.
+        o conteúdo atual com o conteúdo previamente cacheado. Cada nota é
+        passada diretamente ao hash, sem construir uma string com todo o cofre.
 
         Args:
             notas (List[Dict]): Lista de notas com 'titulo' e 'conteudo'.
@@ -307,14 +924,16 @@ class GeradorLinksAvancado:
         Returns:
             str: String hash representando o estado atual das notas.
         """
-        import hashlib
-        conteudo_total = ""
+        h = hashlib.blake2b(digest_size=16)
 
         # Ordena as notas por título para garantir consistência
         for nota in sorted(notas, key=lambda n: n['titulo']):
-            conteudo_total += f"{nota['titulo']}{nota['conteudo']}"
+            h.update(nota['titulo'].encode('utf-8'))
+            h.update(b'\x1f')  # Separa título de conteúdo
+            h.update(nota['conteudo'].encode('utf-8'))
+            h.update(b'\x1e')  # Separa notas
 
-        return hashlib.md5(conteudo_total.encode()).hexdigest()
+        return h.hexdigest()
 
     # ==============================================================================
     # Função: Encontrar Notas Similares com FAISS
@@ -333,35 +952,65 @@ class GeradorLinksAvancado:
         Returns:
             List[Tuple[Dict, float]]: Lista de tuplas com a nota similar e seu score.
         """
-        try:
-            # Garante que o modelo e índice estejam disponíveis
-            if self.indice_faiss is None or self.modelo_embeddings is None:
-                return []
+        return self.encontrar_notas_similares_lote([nota_atual], k)[0]
 
-            # Gera embedding da nota atual
-            texto_atual = f"{nota_atual['titulo']}\n{nota_atual['conteudo']}"
-            embedding_atual = self.modelo_embeddings.encode([texto_atual])
-            embedding_atual = np.array(embedding_atual).astype('float32')
-            faiss.normalize_L2(embedding_atual)
+    def encontrar_notas_similares_lote(self, notas: List[Dict], k: int = 5) -> List[List[Tuple[Dict, float]]]:
+        """
+        Encontra as k notas mais similares para várias notas de uma só vez.
 
-            # Executa busca no índice FAISS
-            scores, indices = self.indice_faiss.search(embedding_atual, k + 1)  # +1 para ignorar a própria nota
+        Notas já indexadas e sem alterações reutilizam o embedding guardado; as
+        restantes são codificadas numa única chamada ao modelo. Todas são
+        pesquisadas com uma única chamada `search` ao índice FAISS.
 
-            notas_similares = []
-            for score, idx in zip(scores[0], indices[0]):
-                if idx == -1:
-                    continue  # Índice inválido
+        Args:
+            notas (List[Dict]): Notas a comparar, cada uma com 'titulo' e 'conteudo'.
+            k (int): Número de notas similares a retornar por nota (default = 5).
 
-                nota_similar = self.mapeamento_notas.get(idx)
-                if nota_similar and nota_similar['titulo'] != nota_atual['titulo']:
-                    if score >= self.limiar_similaridade:
-                        notas_similares.append((nota_similar, float(score)))
+        Returns:
+            List[List[Tuple[Dict, float]]]: Para cada nota, a lista de notas similares e seus scores.
+        """
+        resultados = [[] for _ in notas]
+        try:
+            # Garante que o modelo e índice estejam disponíveis
+            if not notas or self.indice_faiss is None or self.modelo_embeddings is None:
+                return resultados
 
-            return notas_similares
+            # Reutiliza embeddings indexados e codifica apenas as notas novas ou alteradas
+            embeddings = np.empty((len(notas), self.dimensao_embeddings), dtype=np.float32)
+            por_codificar = []
+            for i, nota in enumerate(notas):
+                indexado = self._embedding_indexado(nota)
+                if indexado is None:
+                    por_codificar.append(i)
+                else:
+                    embeddings[i] = indexado
+
+            if por_codificar:
+                textos = [f"{notas[i]['titulo']}\n{notas[i]['conteudo']}" for i in por_codificar]
+                novos = self.modelo_embeddings.encode(textos, convert_to_numpy=True, normalize_embeddings=True)
+                embeddings[por_codificar] = novos
+
+            # Executa uma única busca no índice FAISS
+            scores, indices = self.indice_faiss.search(embeddings, k + 1)  # +1 para ignorar a própria nota
+
+            mapeamento = self.mapeamento_notas
+            limiar = self.limiar_similaridade
+            for nota_atual, notas_similares, linha_scores, linha_indices in zip(notas, resultados, scores, indices):
+                titulo_atual = nota_atual['titulo']
+                for score, idx in zip(linha_scores.tolist(), linha_indices.tolist()):
+                    if idx == -1:
+                        continue  # Índice inválido
+
+                    nota_similar = mapeamento.get(idx)
+                    if nota_similar and nota_similar['titulo'] != titulo_atual:
+                        if score >= limiar:
+                            notas_similares.append((nota_similar, score))
+
+            return resultados
 
         except Exception as e:
-            logger.info(f"Erro ao encontrar notas similares: {e}")
-            return []
+            logger.info("Erro ao encontrar notas similares: %s", e)
+            return [[] for _ in notas]
 
     # ==============================================================================
     # Função: Extração de Conceitos Comuns entre Notas
@@ -383,45 +1032,160 @@ class GeradorLinksAvancado:
             List[str]: Lista dos conceitos comuns encontrados (limitada a 5).
         """
         try:
-            from modulos.conceitos import extrator_conceitos
+            # Termos relevantes e respetivos embeddings de ambas as notas (em cache)
+            termos1, emb1 = self._termos_e_embeddings(nota1['conteudo'])
+            termos2, emb2 = self._termos_e_embeddings(nota2['conteudo'])
 
-            # Extrai conceitos relevantes de ambas as notas
-            conceitos1 = extrator_conceitos.extrair_conceitos_avancados(nota1['conteudo'])
-            conceitos2 = extrator_conceitos.extrair_conceitos_avancados(nota2['conteudo'])
+            if not termos1 or not termos2 or emb1 is None or emb2 is None:
+                return []
 
-            # Filtra e normaliza termos
-            termos1 = [c.termo for c in conceitos1 if len(c.termo) > 2 and c.termo.lower() not in self.stopwords_personalizadas]
-            termos2 = [c.termo for c in conceitos2 if len(c.termo) > 2 and c.termo.lower() not in self.stopwords_personalizadas]
+            if len(termos1) >= LIMIAR_INDICE_CONCEITOS:
+                pares_i, _, _ = self._pares_semelhantes_indice(emb1, emb2, tolerancia)
+            else:
+                # Matriz de similaridade do cosseno entre todos os pares de termos
+                similaridades = np.round(SimilaridadeUtils.similaridade_matriz(emb1, emb2), 4)
+                pares_i, _ = np.nonzero(similaridades >= tolerancia)
 
+            # Conceitos da primeira nota com pelo menos um par semelhante, pela ordem original
+            conceitos_comuns = dict.fromkeys(termos1[i] for i in np.unique(pares_i))
 
-            if not termos1 or not termos2 or self.modelo_embeddings is None:
-                return []
+            return list(conceitos_comuns)[:5]
 
-            # Gera embeddings para os termos das duas notas
-            emb1 = self.modelo_embeddings.encode(termos1)
-            emb2 = self.modelo_embeddings.encode(termos2)
+        except Exception as e:
+            logger.info("Erro ao extrair conceitos comuns semanticamente: %s", e)
+            return []
 
-            conceitos_comuns = set()
+    def _pares_semelhantes_indice(
+        self,
+        emb1: np.ndarray,
+        emb2: np.ndarray,
+        tolerancia: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Obtém os pares de termos acima da tolerância com uma busca por raio no FAISS.
 
-            for i, vetor1 in enumerate(emb1):
-                for j, vetor2 in enumerate(emb2):
-                    chave = tuple(sorted((termos1[i], termos2[j])))
+        O índice com os termos da nota atual é construído uma vez e reutilizado
+        enquanto ela for comparada com as várias notas similares; só os pares
+        acima do raio são devolvidos, sem materializar a matriz completa.
 
-                    # Usa cache para evitar recomputações
-                    if chave in self.cache_similaridade_termos:
-                        score = self.cache_similaridade_termos[chave]
-                    else:
-                        score = SimilaridadeUtils.similaridade(vetor1, vetor2)
-                        self.cache_similaridade_termos[chave] = score
+        Args:
+            emb1 (np.ndarray): Embeddings normalizados dos termos da nota atual.
+            emb2 (np.ndarray): Embeddings normalizados dos termos da outra nota.
+            tolerancia (float): Limiar mínimo de similaridade.
 
-                    if score >= tolerancia:
-                        conceitos_comuns.add(termos1[i])
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Índices dos termos da nota
+            atual, índices dos termos da outra nota e similaridades (4 casas decimais).
+        """
+        if self._indice_conceitos is None or self._indice_conceitos[0] is not emb1:
+            indice = faiss.IndexFlatIP(emb1.shape[1])
+            indice.add(np.ascontiguousarray(emb1, dtype=np.float32))
+            self._indice_conceitos = (emb1, indice)
+        indice = self._indice_conceitos[1]
+
+        # O FAISS devolve scores estritamente acima do raio; o arredondamento decide no fim
+        limites, scores, pares_i = indice.range_search(
+            np.ascontiguousarray(emb2, dtype=np.float32), tolerancia - 5e-5
+        )
+        pares_j = np.repeat(np.arange(len(emb2)), np.diff(limites.astype(np.int64)))
+        scores = np.round(scores, 4)
+        acima = scores >= tolerancia
+        return pares_i[acima], pares_j[acima], scores[acima]
+
+    def _termos_e_embeddings(self, conteudo: str) -> Tuple[List[str], Optional[np.ndarray]]:
+        """
+        Extrai os termos relevantes de um texto e gera os seus embeddings normalizados.
 
-            return list(conceitos_comuns)[:5]
+        O resultado fica numa cache LRU indexada pelo conteúdo, para que a nota
+        atual seja codificada uma única vez ao ser comparada com várias notas
+        similares, e para que notas vizinhas não voltem a ser codificadas.
 
-        except Exception as e:
-            logger.info(f"Erro ao extrair conceitos comuns semanticamente: {e}")
-            return []
+        Args:
+            conteudo (str): Conteúdo da nota.
+
+        Returns:
+            Tuple[List[str], Optional[np.ndarray]]: Termos filtrados e matriz float32
+            com um embedding por termo (None se o modelo não estiver carregado).
+        """
+        cache = self._cache_conceitos_notas
+        em_cache = cache.get(conteudo)
+        if em_cache is not None:
+            cache.move_to_end(conteudo)
+            return em_cache
+
+        termos = self._extrair_termos(conteudo)
+        if not termos or self.modelo_embeddings is None:
+            return termos, None
+
+        embeddings = np.asarray(
+            self.modelo_embeddings.encode(termos, convert_to_numpy=True, normalize_embeddings=True),
+            dtype=np.float32
+        )
+        self._guardar_termos_e_embeddings(conteudo, termos, embeddings)
+        return termos, embeddings
+
+    def _codificar_termos_notas(self, conteudos: Iterable[str]):
+        """
+        Codifica numa única chamada ao modelo os termos de vários textos ainda fora da cache.
+
+        Em vez de uma passagem pelo modelo por nota, os termos de todas as notas
+        são juntos num só lote e os embeddings são depois repartidos por nota,
+        ficando na cache usada por `_termos_e_embeddings`.
+
+        Args:
+            conteudos (Iterable[str]): Conteúdos das notas a preparar.
+        """
+        if self.modelo_embeddings is None:
+            return
+
+        cache = self._cache_conceitos_notas
+        pendentes: Dict[str, List[str]] = {}
+        for conteudo in conteudos:
+            if conteudo in cache or conteudo in pendentes:
+                continue
+            termos = self._extrair_termos(conteudo)
+            if termos:
+                pendentes[conteudo] = termos
+            else:
+                self._guardar_termos_e_embeddings(conteudo, termos, None)
+        if not pendentes:
+            return
+
+        todos_termos = [termo for termos in pendentes.values() for termo in termos]
+        embeddings = np.asarray(
+            self.modelo_embeddings.encode(
+                todos_termos, batch_size=128, convert_to_numpy=True, normalize_embeddings=True
+            ),
+            dtype=np.float32
+        )
+
+        inicio = 0
+        for conteudo, termos in pendentes.items():
+            fim = inicio + len(termos)
+            self._guardar_termos_e_embeddings(conteudo, termos, embeddings[inicio:fim])
+            inicio = fim
+
+    def _extrair_termos(self, conteudo: str) -> List[str]:
+        """
+        Extrai os termos relevantes de um texto, sem stopwords nem termos curtos.
+
+        Args:
+            conteudo (str): Conteúdo da nota.
+
+        Returns:
+            List[str]: Termos filtrados, pela ordem do extrator de conceitos.
+        """
+        from modulos.conceitos import extrator_conceitos
+
+        conceitos = extrator_conceitos.extrair_conceitos_avancados(conteudo)
+        return [c.termo for c in conceitos if len(c.termo) > 2 and c.termo.lower() not in self.stopwords_personalizadas]
+
+    def _guardar_termos_e_embeddings(self, conteudo: str, termos: List[str], embeddings: Optional[np.ndarray]):
+        """Guarda os termos e embeddings de um texto na cache LRU, descartando o mais antigo."""
+        cache = self._cache_conceitos_notas
+        cache[conteudo] = (termos, embeddings)
+        if len(cache) > MAX_CACHE_CONCEITOS_NOTAS:
+            cache.popitem(last=False)
 
     # ==============================================================================
     # Função: Extração de Contexto por Posição
@@ -446,7 +1210,7 @@ class GeradorLinksAvancado:
             contexto = texto[inicio:fim].strip()
 
             # Remove espaços múltiplos ou quebras de linha
-            contexto = re.sub(r'\s+', ' ', contexto)
+            contexto = _RE_ESPACOS.sub(' ', contexto)
 
             # Adiciona reticências para indicar truncamento
             if inicio > 0:
@@ -457,7 +1221,7 @@ class GeradorLinksAvancado:
             return contexto
 
         except Exception as e:
-            logger.warning(f"Erro ao extrair contexto por posição: {e}")
+            logger.warning("Erro ao extrair contexto por posição: %s", e)
             return ""
 
     def _normalizar(self, texto: str) -> str:
@@ -504,37 +1268,52 @@ class GeradorLinksAvancado:
         sugestoes = []
         sugestoes_existentes = set()
         conteudo = nota_atual.get('conteudo', '')
-        paragrafos = re.split(r'\n\s*\n', conteudo)  # Divide por parágrafos (linhas em branco)
-
-        for nota_similar, score in notas_similares:
-            conceitos_comuns = self.extrair_conceitos_comuns(nota_atual, nota_similar)
-
+        paragrafos = _RE_PARAGRAFOS.split(conteudo)  # Divide por parágrafos (linhas em branco)
+
+        # Posição de cada parágrafo no texto completo
+        posicoes_paragrafos = []
+        posicao = 0
+        for paragrafo in paragrafos:
+            posicoes_paragrafos.append(posicao)
+            posicao += len(paragrafo) + 2
+
+        # Termos de todas as notas codificados num único lote antes das comparações
+        self._codificar_termos_notas(
+            [conteudo] + [nota_similar.get('conteudo', '') for nota_similar, _ in notas_similares]
+        )
+
+        # Conceitos comuns com cada nota similar, localizados todos de uma vez
+        conceitos_por_nota = [
+            (nota_similar, score, self.extrair_conceitos_comuns(nota_atual, nota_similar))
+            for nota_similar, score in notas_similares
+        ]
+        ocorrencias = _localizar_conceitos(
+            (c for _, _, conceitos_comuns in conceitos_por_nota for c in conceitos_comuns), paragrafos
+        )
+
+        for nota_similar, score, conceitos_comuns in conceitos_por_nota:
             for conceito in conceitos_comuns:
                 chave = (conceito.lower(), nota_similar['titulo'].lower())
                 if chave in sugestoes_existentes:
                     continue  # Evita duplicação
 
-                termo_encontrado = False
-
                 # ----------------------------------------------------------------------
-                # Busca Literal: tenta localizar o conceito diretamente nos parágrafos
+                # Busca Literal: usa a ocorrência localizada nos parágrafos
                 # ----------------------------------------------------------------------
-                for i, paragrafo in enumerate(paragrafos):
-                    if conceito.lower() in paragrafo.lower():
-                        match = re.search(rf'\b{re.escape(conceito)}\b', paragrafo, re.IGNORECASE)
-                        if match:
-                            pos_paragrafo = sum(len(p) + 2 for p in paragrafos[:i])  # posição no texto completo
-                            sugestoes.append(LinkSugerido(
-                                termo=conceito,
-                                nota_destino=nota_similar['titulo'],
-                                posicao_inicio=pos_paragrafo + match.start(),
-                                posicao_fim=pos_paragrafo + match.end(),
-                                score_similaridade=score,
-                                contexto=paragrafo.strip(),
-                                tipo="literal"
-                            ))
-                            termo_encontrado = True
-                            break
+                ocorrencia = ocorrencias.get(conceito)
+                termo_encontrado = ocorrencia is not None
+                if termo_encontrado:
+                    i, inicio, fim = ocorrencia
+                    pos_paragrafo = posicoes_paragrafos[i]  # posição no texto completo
+                    sugestoes.append(LinkSugerido(
+                        termo=conceito,
+                        nota_destino=nota_similar['titulo'],
+                        posicao_inicio=pos_paragrafo + inicio,
+                        posicao_fim=pos_paragrafo + fim,
+                        score_similaridade=score,
+                        contexto=paragrafos[i].strip(),
+                        tipo="literal"
+                    ))
 
                 # ----------------------------------------------------------------------
                 # Fallback Semântico: tenta encontrar termo equivalente se literal falhar
@@ -579,17 +1358,18 @@ class GeradorLinksAvancado:
     # Funções Auxiliares: Stopwords Personalizadas e Filtro por Parágrafo
     # ==============================================================================
 
-    def atualizar_stopwords_personalizadas(self, lista: List[str]):
+    def atualizar_stopwords_personalizadas(self, lista: Iterable[str]):
         """
-        Atualiza a lista de stopwords personalizadas em tempo de execução.
+        Atualiza o conjunto de stopwords personalizadas em tempo de execução.
 
         Permite adaptar dinamicamente o comportamento do filtro de termos irrelevantes
         com base no contexto específico do utilizador ou domínio.
 
         Args:
-            lista (List[str]): Lista de termos a serem tratados como stopwords.
+            lista (Iterable[str]): Termos a serem tratados como stopwords.
         """
-        self.stopwords_personalizadas = set(lista)
+        self.stopwords_personalizadas = frozenset(lista)
+        self._cache_conceitos_notas.clear()  # Os termos filtrados dependem das stopwords
 
     def _filtrar_por_paragrafo(self, sugestoes: List[LinkSugerido], conteudo: str) -> List[LinkSugerido]:
         """
@@ -608,30 +1388,35 @@ class GeradorLinksAvancado:
         paragrafos = conteudo.split('\n\n')  # Divide conteúdo por parágrafos
         sugestoes_filtradas = []
 
-        for i, paragrafo in enumerate(paragrafos):
-            pos_paragrafo = sum(len(p) + 2 for p in paragrafos[:i])  # Posição de início do parágrafo
-            pos_fim_paragrafo = pos_paragrafo + len(paragrafo)
+        # Posições de início e fim de cada parágrafo (somas acumuladas)
+        inicios, fins = [], []
+        posicao = 0
+        for paragrafo in paragrafos:
+            inicios.append(posicao)
+            fins.append(posicao + len(paragrafo))
+            posicao += len(paragrafo) + 2
 
-            # Seleciona sugestões localizadas dentro deste parágrafo
-            sugestoes_paragrafo = [
-                s for s in sugestoes 
-                if pos_paragrafo <= s.posicao_inicio < pos_fim_paragrafo
-            ]
+        # Distribui as sugestões pelos parágrafos numa única passagem
+        por_paragrafo: List[List[LinkSugerido]] = [[] for _ in paragrafos]
+        for s in sugestoes:
+            i = bisect.bisect_right(inicios, s.posicao_inicio) - 1
+            if i >= 0 and s.posicao_inicio < fins[i]:
+                por_paragrafo[i].append(s)
 
+        for sugestoes_paragrafo in por_paragrafo:
             # Separa por tipo
             literais = [s for s in sugestoes_paragrafo if s.tipo == 'literal']
             semanticos = [s for s in sugestoes_paragrafo if s.tipo == 'semantico']
 
-            # Ordena por score decrescente
-            literais.sort(key=lambda s: s.score_similaridade, reverse=True)
-            semanticos.sort(key=lambda s: s.score_similaridade, reverse=True)
-
-            # Adiciona até o máximo permitido por parágrafo
-            sugestoes_filtradas.extend(literais[:self.max_links_por_paragrafo])
+            # Adiciona até o máximo permitido por parágrafo, por score decrescente
+            # (nlargest equivale a ordenar e cortar, sem ordenar a lista inteira)
+            sugestoes_filtradas.extend(
+                heapq.nlargest(self.max_links_por_paragrafo, literais, key=_score_sugestao)
+            )
 
             if len(literais) < self.max_links_por_paragrafo:
                 restante = self.max_links_por_paragrafo - len(literais)
-                sugestoes_filtradas.extend(semanticos[:restante])
+                sugestoes_filtradas.extend(heapq.nlargest(restante, semanticos, key=_score_sugestao))
 
         return sugestoes_filtradas
     
@@ -654,6 +1439,13 @@ class GeradorLinksAvancado:
             List[LinkSugerido]: Lista de sugestões geradas para a nota.
         """
         sugestoes = []
+        self._cache_candidatos.clear()  # Candidatos só são reutilizados dentro da mesma nota
+
+        # Resultados de termos similares continuam válidos enquanto o conteúdo não mudar
+        hash_conteudo = hash(nota.get('conteudo', ''))
+        if hash_conteudo != self._hash_ultimo_conteudo:
+            self._cache_termo_similar.clear()
+            self._hash_ultimo_conteudo = hash_conteudo
 
         if not getattr(self, "modo_semantico", True):
             logger.info("Modo semântico desativado — ignorando geração de links automáticos.")
@@ -677,7 +1469,7 @@ class GeradorLinksAvancado:
             return sugestoes
 
         except Exception as e:
-            logger.info(f"Erro ao processar nota para links: {e}")
+            logger.info("Erro ao processar nota para links: %s", e)
             return []
 
     # ==============================================================================
@@ -709,16 +1501,22 @@ class GeradorLinksAvancado:
     # Função: Configurar Parâmetros de Similaridade e Limite por Parágrafo
     # ==============================================================================
 
-    def configurar_parametros(self, limiar_similaridade: float = 0.15, max_links_por_paragrafo: int = 3):
+    def configurar_parametros(self, limiar_similaridade: float = 0.15, max_links_por_paragrafo: int = 3,
+                              nprobe: Optional[int] = None):
         """
         Atualiza os parâmetros de funcionamento do gerador de links.
 
         Args:
             limiar_similaridade (float): Valor mínimo de similaridade para sugerir links.
             max_links_por_paragrafo (int): Número máximo de links permitidos por parágrafo.
+            nprobe (Optional[int]): Células visitadas por busca num índice IVF (mais = mais exato).
         """
         self.limiar_similaridade = limiar_similaridade
         self.max_links_por_paragrafo = max_links_por_paragrafo
+        if nprobe is not None:
+            self.nprobe = max(1, int(nprobe))
+            if hasattr(self.indice_faiss, "nprobe"):  # IndexIVF na CPU ou na GPU
+                self.indice_faiss.nprobe = min(self.indice_faiss.nlist, self.nprobe)
 
 
 # ==============================================================================
@@ -14,10 +14,42 @@ Descrição: Módulo de gravação de notas no sistema de ficheiros.
 
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# A partir deste número de notas, a gravação em lote é feita por várias threads
+LIMIAR_GRAVACAO_PARALELA = 16
+
+# Flags de os.open equivalentes a open(caminho, 'w'); O_BINARY só existe no Windows
+_FLAGS_ESCRITA = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+
+def _escrever_texto(caminho: str, conteudo: str):
+    """
+    Escreve texto em UTF-8 diretamente no descritor do ficheiro.
+
+    Evita as camadas TextIOWrapper/BufferedWriter de open(): o conteúdo é
+    codificado uma vez e passado ao sistema com os.write. Os fins de linha
+    são convertidos para os.linesep, como na escrita em modo texto.
+
+    Args:
+        caminho (str): Caminho completo do ficheiro.
+        conteudo (str): Texto a gravar.
+    """
+    if os.linesep != '\n':
+        conteudo = conteudo.replace('\n', os.linesep)
+    dados = memoryview(conteudo.encode('utf-8'))
+
+    fd = os.open(caminho, _FLAGS_ESCRITA, 0o666)
+    try:
+        # os.write pode escrever apenas parte dos dados
+        while dados:
+            dados = dados[os.write(fd, dados):]
+    finally:
+        os.close(fd)
+
 
 class GravadorNotas:
     """
@@ -49,17 +81,44 @@ class GravadorNotas:
         if not caminho:
             return False, "Caminho do ficheiro não especificado"
 
-        if not os.path.isabs(caminho):
-            caminho = os.path.join(self.diretorio_notas, caminho)
+        caminho = self._resolver_caminho(caminho)
 
         try:
             os.makedirs(os.path.dirname(caminho), exist_ok=True)
 
-            if not os.access(os.path.dirname(caminho), os.W_OK):
-                return False, "Sem permissão de escrita no diretório"
+            # Sem verificação prévia de permissões: a própria escrita falha com PermissionError
+            return self._escrever_ficheiro(caminho, conteudo)
 
-            with open(caminho, 'w', encoding='utf-8') as f:
-                f.write(conteudo)
+        except Exception as e:
+            return False, f"Erro ao gravar nota: {str(e)}"
+
+    def _resolver_caminho(self, caminho: str) -> str:
+        """
+        Converte um caminho relativo num caminho dentro do diretório de notas.
+
+        Args:
+            caminho (str): Caminho absoluto ou relativo ao diretório de notas.
+
+        Returns:
+            str: Caminho onde a nota será gravada.
+        """
+        if not os.path.isabs(caminho):
+            caminho = os.path.join(self.diretorio_notas, caminho)
+        return caminho
+
+    def _escrever_ficheiro(self, caminho: str, conteudo: str) -> Tuple[bool, Optional[str]]:
+        """
+        Escreve o conteúdo da nota num ficheiro cujo diretório já existe.
+
+        Args:
+            caminho (str): Caminho completo do ficheiro.
+            conteudo (str): Texto da nota.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Sucesso da operação e mensagem de erro (se houver).
+        """
+        try:
+            _escrever_texto(caminho, conteudo)
 
             logger.info(f"Nota gravada com sucesso em: {caminho}")
             return True, None
@@ -71,6 +130,10 @@ class GravadorNotas:
         """
         Grava um conjunto de notas em lote, retornando estatísticas da operação.
 
+        Os caminhos são resolvidos uma única vez e cada diretório de destino é
+        criado apenas uma vez, mesmo que contenha várias notas; as falhas de
+        permissão surgem na própria escrita do ficheiro.
+
         Args:
             notas (List[Dict]): Lista de dicionários com dados das notas.
 
@@ -83,18 +146,49 @@ class GravadorNotas:
             "total": len(notas)
         }
 
+        # Caminhos resolvidos (None se a nota não indicar caminho); o diretório
+        # base com o separador é calculado uma vez e apenas concatenado
+        prefixo = os.path.join(self.diretorio_notas, '')
+        caminhos = []
         for nota in notas:
-            caminho = nota.get('caminho', 'desconhecido')
+            caminho = nota.get('caminho')
+            if not caminho:
+                caminhos.append(None)
+            else:
+                caminhos.append(caminho if os.path.isabs(caminho) else prefixo + caminho)
+
+        # Cria cada diretório de destino uma única vez
+        erros_diretorio: Dict[str, str] = {}
+        for diretorio in {os.path.dirname(c) for c in caminhos if c is not None}:
             try:
-                sucesso, erro = self.gravar_nota_individual(nota)
-
-                if sucesso:
-                    resultado["sucesso"] += 1
-                elif erro:
-                    resultado["erros"].append(f"{caminho}: {erro}")
+                os.makedirs(diretorio, exist_ok=True)
+            except Exception as e:
+                erros_diretorio[diretorio] = f"Erro ao gravar nota: {str(e)}"
 
+        def gravar(nota: Dict, caminho_resolvido: Optional[str]) -> Tuple[bool, Optional[str]]:
+            try:
+                if caminho_resolvido is None:
+                    return False, "Caminho do ficheiro não especificado"
+                if os.path.dirname(caminho_resolvido) in erros_diretorio:
+                    return False, erros_diretorio[os.path.dirname(caminho_resolvido)]
+                return self._escrever_ficheiro(caminho_resolvido, nota.get('conteudo', ''))
             except Exception as e:
-                resultado["erros"].append(f"{caminho}: {str(e)}")
+                return False, str(e)
+
+        # As escritas sobrepõem-se em threads; com caminhos repetidos mantém-se a
+        # ordem sequencial para que a última nota continue a prevalecer
+        caminhos_unicos = len(set(caminhos)) == len(caminhos)
+        if len(notas) >= LIMIAR_GRAVACAO_PARALELA and caminhos_unicos:
+            with ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 1) * 2)) as executor:
+                estados = list(executor.map(gravar, notas, caminhos))
+        else:
+            estados = [gravar(nota, c) for nota, c in zip(notas, caminhos)]
+
+        for nota, (sucesso, erro) in zip(notas, estados):
+            if sucesso:
+                resultado["sucesso"] += 1
+            elif erro:
+                resultado["erros"].append(f"{nota.get('caminho', 'desconhecido')}: {erro}")
 
         return resultado
 
@@ -114,8 +208,7 @@ class GravadorNotas:
         try:
             os.makedirs(os.path.dirname(caminho), exist_ok=True)
 
-            with open(caminho, 'w', encoding='utf-8') as f:
-                f.write(conteudo)
+            _escrever_texto(caminho, conteudo)
 
             return True, None
 
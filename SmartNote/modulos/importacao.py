@@ -15,17 +15,46 @@ Descrição: Módulo de importação de notas a partir de ficheiros locais (.md,
 """
 
 import os
+import sys
+import codecs
 import yaml
 import re
 import logging
+from collections import deque
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
+# Loader em C (libyaml) quando o PyYAML foi compilado com ele; mesma semântica do safe_load
+try:
+    from yaml import CSafeLoader as _CarregadorYAML
+except ImportError:
+    from yaml import SafeLoader as _CarregadorYAML
+
 logger = logging.getLogger(__name__)
 
+# A partir deste número de ficheiros, a leitura é feita por várias threads
+LIMIAR_IMPORTACAO_PARALELA = 16
+MAX_FICHEIROS_PENDENTES = 256  # Ficheiros submetidos às threads e ainda não recolhidos
+
+# Extensões em que o início "---" delimita frontmatter YAML
+EXTENSOES_MARKDOWN = ('.md', '.markdown')
+EXTENSOES_VALIDAS = EXTENSOES_MARKDOWN + ('.txt',)  # Tuplo, para str.endswith
+
+# Codificações testadas por ordem ao ler uma nota
+CODIFICACOES = ('utf-8', 'utf-8-sig', 'latin-1', 'cp1252')
+
+# Bytes lidos inicialmente para detetar a codificação e verificar a legibilidade
+TAMANHO_AMOSTRA_LEITURA = 4096
 
-@dataclass
+# `slots=True` só existe a partir do Python 3.10; em versões anteriores a
+# dataclass mantém o __dict__ por instância.
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class NotaImportada:
     """
     Estrutura que representa uma nota importada de um ficheiro.
@@ -36,7 +65,7 @@ class NotaImportada:
         caminho (str): Caminho completo do ficheiro.
         frontmatter (Dict): Metadados extraídos em formato YAML.
         tamanho (int): Tamanho do ficheiro em bytes.
-        data_modificacao (datetime): Data de modificação do ficheiro.
+        mtime (float): Data de modificação do ficheiro (timestamp do stat).
         valida (bool): Indica se a nota foi importada com sucesso.
         erro (Optional[str]): Mensagem de erro, se aplicável.
     """
@@ -45,10 +74,89 @@ class NotaImportada:
     caminho: str
     frontmatter: Dict
     tamanho: int
-    data_modificacao: datetime
+    mtime: float
     valida: bool
     erro: Optional[str] = None
 
+    @property
+    def data_modificacao(self) -> datetime:
+        """
+        Data de modificação do ficheiro, convertida apenas quando é pedida.
+
+        Returns:
+            datetime: Data local correspondente a `mtime`.
+        """
+        return datetime.fromtimestamp(self.mtime)
+
+# Frontmatter YAML delimitado por linhas "---" no início do ficheiro
+_RE_FRONTMATTER = re.compile(r'^---\s*\r?\n(.*?)\r?\n---\s*\r?\n(.*)', re.DOTALL)
+
+# Linha "chave: valor" simples do frontmatter (sem indentação nem estrutura)
+_RE_LINHA_SIMPLES = re.compile(r'([A-Za-z_][A-Za-z0-9_-]*):(?:[ ]+(.*))?')
+_INDICADORES_YAML = frozenset('-?:,[]{}#&*!|>\'"%@`')
+_TAG_STR_YAML = 'tag:yaml.org,2002:str'
+_resolvedor_yaml = yaml.resolver.Resolver()
+
+
+def _texto_simples_yaml(valor: str) -> bool:
+    """
+    Verifica se o YAML leria o valor como uma string simples, igual ao texto.
+
+    Args:
+        valor (str): Escalar sem espaços nas pontas.
+
+    Returns:
+        bool: False se o valor tiver estrutura YAML ou outro tipo (número,
+        booleano, data, nulo), casos em que é preciso o parser completo.
+    """
+    return (
+        valor[0] not in _INDICADORES_YAML
+        and not valor.endswith(':')
+        and ': ' not in valor
+        and ' #' not in valor
+        and valor.isprintable()
+        and _resolvedor_yaml.resolve(yaml.ScalarNode, valor, (True, False)) == _TAG_STR_YAML
+    )
+
+
+def _analisar_frontmatter(bloco: str) -> Dict:
+    """
+    Converte o bloco de frontmatter num dicionário.
+
+    O caso mais comum, linhas "chave: texto" sem listas, aspas nem valores
+    tipados, é lido diretamente; qualquer outra construção é entregue ao
+    parser YAML, com o mesmo resultado que `yaml.safe_load`.
+
+    Args:
+        bloco (str): Texto entre os delimitadores "---".
+
+    Returns:
+        Dict: Metadados da nota (vazio se o bloco não tiver conteúdo).
+    """
+    metadados = {}
+    for linha in bloco.split('\n'):
+        if not linha.strip():
+            continue
+        match = _RE_LINHA_SIMPLES.fullmatch(linha.rstrip(' '))
+        if match is None or not _texto_simples_yaml(match.group(1)):
+            break
+        valor = match.group(2)
+        if valor is None:
+            metadados[match.group(1)] = None
+        elif _texto_simples_yaml(valor):
+            metadados[match.group(1)] = valor
+        else:
+            break
+    else:
+        return metadados
+
+    return yaml.load(bloco, Loader=_CarregadorYAML) or {}
+
+
+# Caracteres até U+00FF que não são imprimíveis nem espaço (controlo), como bytes latin-1
+_BYTES_LATIN1_ILEGIVEIS = bytes(b for b in range(256) if not (chr(b).isprintable() or chr(b).isspace()))
+
+
 def _conteudo_legivel(texto: str) -> bool:
     """
     Verifica se o conteúdo é predominantemente legível com base em amostragem.
@@ -60,16 +168,173 @@ def _conteudo_legivel(texto: str) -> bool:
         bool: True se pelo menos 90% dos primeiros 100 caracteres forem imprimíveis.
     """
     amostra = texto[:100]
-    legiveis = sum(c.isprintable() or c.isspace() for c in amostra)
-    return (len(amostra) == 0) or (legiveis / len(amostra) >= 0.9)
+    if not amostra:
+        return True
+    if max(amostra) <= '\xff':
+        # Texto ASCII ou latin-1 (inclui os acentos do português): cada caractere
+        # é um byte, e uma única chamada em C remove os ilegíveis
+        legiveis = len(amostra.encode('latin-1').translate(None, _BYTES_LATIN1_ILEGIVEIS))
+    else:
+        legiveis = sum(c.isprintable() or c.isspace() for c in amostra)
+    return legiveis / len(amostra) >= 0.9
+
 
 
+def _descodificar(dados: bytes, codificacoes: Tuple[str, ...], final: bool) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Descodifica bytes com a primeira codificação da lista que os aceite.
+
+    Args:
+        dados (bytes): Conteúdo do ficheiro (ou o seu início).
+        codificacoes (Tuple[str, ...]): Codificações a testar, por ordem.
+        final (bool): False se `dados` for apenas o início do ficheiro; um
+            caractere multibyte cortado no fim não conta como erro.
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: Codificação usada e texto, ou
+        (None, None) se nenhuma servir.
+    """
+    for cod in codificacoes:
+        try:
+            return cod, codecs.getincrementaldecoder(cod)().decode(dados, final=final)
+        except UnicodeDecodeError:
+            continue
+    return None, None
+
+
+def _normalizar_fins_linha(texto: str) -> str:
+    """Converte fins de linha \\r\\n e \\r em \\n, como a leitura em modo texto."""
+    if '\r' in texto:
+        texto = texto.replace('\r\n', '\n').replace('\r', '\n')
+    return texto
+
+
+def _processar_ficheiro(entrada: os.DirEntry) -> Tuple[Optional[NotaImportada], Optional[str]]:
+    """
+    Lê e processa um único ficheiro de nota.
+
+    Trata as diferentes codificações, valida a legibilidade e extrai o
+    frontmatter (YAML) das notas Markdown. É independente dos restantes ficheiros, podendo
+    correr em paralelo.
+
+    Args:
+        entrada (os.DirEntry): Entrada do diretório com uma extensão válida.
+
+    Returns:
+        Tuple[Optional[NotaImportada], Optional[str]]: Nota importada (ou None
+        se a entrada não for um ficheiro) e mensagem de erro, se aplicável.
+    """
+    codificacoes = CODIFICACOES
+    nome_ficheiro = entrada.name
+    caminho = entrada.path
+    # Separado uma única vez; como em os.path.splitext, pontos iniciais não marcam extensão
+    titulo, ponto, extensao = nome_ficheiro.rpartition('.')
+    if titulo.strip('.'):
+        extensao = (ponto + extensao).lower()
+    else:
+        titulo, extensao = nome_ficheiro, ''
+
+    try:
+        if not entrada.is_file():
+            return None, None
+        stat = entrada.stat()
+    except Exception as e:
+        return None, f"{nome_ficheiro}: Erro ao acessar o arquivo - {e}"
+
+    # Lê primeiro uma amostra: um ficheiro ilegível é rejeitado sem ler o resto.
+    # As codificações são testadas sobre os bytes em memória, sem reabrir o ficheiro.
+    try:
+        with open(caminho, 'rb') as f:
+            dados = f.read(TAMANHO_AMOSTRA_LEITURA)
+            completo = len(dados) < TAMANHO_AMOSTRA_LEITURA
+
+            if dados.startswith(codecs.BOM_UTF8):
+                codificacoes = ('utf-8-sig',)
+
+            cod_amostra, amostra = _descodificar(dados, codificacoes, final=completo)
+            if amostra is not None and not _conteudo_legivel(_normalizar_fins_linha(amostra)):
+                return NotaImportada(
+                    titulo=titulo,
+                    conteudo="",
+                    caminho=caminho,
+                    frontmatter={},
+                    tamanho=stat.st_size,
+                    mtime=stat.st_mtime,
+                    valida=False,
+                    erro="Conteúdo ilegível"
+                ), f"{nome_ficheiro}: Conteúdo ilegível."
+
+            if not completo:
+                dados += f.read()
+    except Exception as e:
+        return None, f"{nome_ficheiro}: Erro ao acessar o arquivo - {e}"
+
+    # O ficheiro completo pode falhar numa codificação que a amostra aceitou
+    if cod_amostra is not None:
+        codificacoes = codificacoes[codificacoes.index(cod_amostra):]
+    cod, conteudo = _descodificar(dados, codificacoes, final=True)
+    if conteudo is None:
+        return NotaImportada(
+            titulo=titulo,
+            conteudo="",
+            caminho=caminho,
+            frontmatter={},
+            tamanho=stat.st_size,
+            mtime=stat.st_mtime,
+            valida=False,
+            erro="Erro de codificação"
+        ), f"{nome_ficheiro}: Erro de codificação."
+
+    conteudo = _normalizar_fins_linha(conteudo)
+
+    # Só volta a verificar se a codificação final não foi a da amostra
+    if cod != cod_amostra and not _conteudo_legivel(conteudo):
+        return NotaImportada(
+            titulo=titulo,
+            conteudo="",
+            caminho=caminho,
+            frontmatter={},
+            tamanho=stat.st_size,
+            mtime=stat.st_mtime,
+            valida=False,
+            erro="Conteúdo ilegível"
+        ), f"{nome_ficheiro}: Conteúdo ilegível."
+
+    frontmatter = {}
+    # Frontmatter é uma convenção Markdown: ficheiros .txt ficam como estão. O
+    # prefixo evita entrar no motor de regex em notas sem frontmatter.
+    match = None
+    if extensao in EXTENSOES_MARKDOWN and conteudo.startswith('---'):
+        match = _RE_FRONTMATTER.match(conteudo)
+    if match:
+        try:
+            frontmatter = _analisar_frontmatter(match.group(1))
+            conteudo = match.group(2)
+        except Exception as e:
+            logger.warning(f"{nome_ficheiro}: Erro ao processar frontmatter - {e}")
+
+    try:
+        return NotaImportada(
+            titulo=titulo,
+            conteudo=conteudo,
+            caminho=caminho,
+            frontmatter=frontmatter,
+            tamanho=stat.st_size,
+            mtime=stat.st_mtime,
+            valida=True
+        ), None
+    except Exception as e:
+        return None, f"{nome_ficheiro}: Erro ao processar nota - {e}"
+
 
 def importar_diretorio(caminho_base: str) -> Tuple[List[NotaImportada], List[str]]:
     """
     Importa notas de um diretório local, processando ficheiros .md, .txt e similares.
 
     Lê conteúdo, extrai frontmatter (YAML), valida legibilidade e trata diferentes codificações.
+    Com muitos ficheiros, a leitura é distribuída por um conjunto de threads, para que
+    as esperas de disco se sobreponham, enquanto o diretório continua a ser
+    percorrido; a ordem das notas é a do diretório.
 
     Args:
         caminho_base (str): Caminho para o diretório com as notas.
@@ -81,80 +346,36 @@ def importar_diretorio(caminho_base: str) -> Tuple[List[NotaImportada], List[str
     notas = []
     erros = []
 
-    extensoes_validas = {'.md', '.markdown', '.txt'}
-    codificacoes = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252']
-
     if not os.path.isdir(caminho_base):
         return [], [f"Diretório inválido: {caminho_base}"]
 
-    for nome_ficheiro in os.listdir(caminho_base):
-        caminho = os.path.join(caminho_base, nome_ficheiro)
-
-        if os.path.isfile(caminho):
-            _, ext = os.path.splitext(nome_ficheiro.lower())
-            if ext in extensoes_validas:
-                try:
-                    stat = os.stat(caminho)
-                except Exception as e:
-                    erros.append(f"{nome_ficheiro}: Erro ao acessar o arquivo - {e}")
-                    continue
-
-                conteudo = None
-                for cod in codificacoes:
-                    try:
-                        with open(caminho, 'r', encoding=cod) as f:
-                            conteudo = f.read()
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                else:
-                    notas.append(NotaImportada(
-                        titulo=os.path.splitext(nome_ficheiro)[0],
-                        conteudo="",
-                        caminho=caminho,
-                        frontmatter={},
-                        tamanho=stat.st_size,
-                        data_modificacao=datetime.fromtimestamp(stat.st_mtime),
-                        valida=False,
-                        erro="Erro de codificação"
-                    ))
-                    erros.append(f"{nome_ficheiro}: Erro de codificação.")
-                    continue
-
-                if not _conteudo_legivel(conteudo):
-                    notas.append(NotaImportada(
-                        titulo=os.path.splitext(nome_ficheiro)[0],
-                        conteudo=conteudo,
-                        caminho=caminho,
-                        frontmatter={},
-                        tamanho=stat.st_size,
-                        data_modificacao=datetime.fromtimestamp(stat.st_mtime),
-                        valida=False,
-                        erro="Conteúdo ilegível"
-                    ))
-                    erros.append(f"{nome_ficheiro}: Conteúdo ilegível.")
-                    continue
-
-                frontmatter = {}
-                match = re.match(r'^---\s*\r?\n(.*?)\r?\n---\s*\r?\n(.*)', conteudo, re.DOTALL)
-                if match:
-                    try:
-                        frontmatter = yaml.safe_load(match.group(1)) or {}
-                        conteudo = match.group(2)
-                    except Exception as e:
-                        logger.warning(f"{nome_ficheiro}: Erro ao processar frontmatter - {e}")
-
-                try:
-                    notas.append(NotaImportada(
-                        titulo=os.path.splitext(nome_ficheiro)[0],
-                        conteudo=conteudo,
-                        caminho=caminho,
-                        frontmatter=frontmatter,
-                        tamanho=stat.st_size,
-                        data_modificacao=datetime.fromtimestamp(stat.st_mtime),
-                        valida=True
-                    ))
-                except Exception as e:
-                    erros.append(f"{nome_ficheiro}: Erro ao processar nota - {e}")
+    def recolher(resultado: Tuple[Optional[NotaImportada], Optional[str]]):
+        nota, erro = resultado
+        if nota is not None:
+            notas.append(nota)
+        if erro:
+            erros.append(erro)
+
+    # scandir devolve o tipo de cada entrada junto com o nome, evitando um stat por
+    # ficheiro; as entradas são consumidas à medida que são lidas do diretório
+    with os.scandir(caminho_base) as iterador:
+        entradas = (e for e in iterador if e.name.lower().endswith(EXTENSOES_VALIDAS))
+        primeiras = list(islice(entradas, LIMIAR_IMPORTACAO_PARALELA))
+
+        if len(primeiras) < LIMIAR_IMPORTACAO_PARALELA:
+            for entrada in primeiras:
+                recolher(_processar_ficheiro(entrada))
+            return notas, erros
+
+        # No máximo MAX_FICHEIROS_PENDENTES ficheiros em curso: a memória não
+        # cresce com o tamanho do diretório e as primeiras notas ficam logo prontas
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            pendentes = deque()
+            for entrada in chain(primeiras, entradas):
+                if len(pendentes) >= MAX_FICHEIROS_PENDENTES:
+                    recolher(pendentes.popleft().result())
+                pendentes.append(executor.submit(_processar_ficheiro, entrada))
+            while pendentes:
+                recolher(pendentes.popleft().result())
 
     return notas, erros
@@ -12,20 +12,122 @@ Descrição: Geração de links semânticos entre notas utilizando embeddings e
 ===============================================================================
 """
 
+import hashlib
 import logging
+import math
+import os
 import re
+import threading
+from bisect import bisect_right
 import faiss
 import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 from sentence_transformers import SentenceTransformer
-from modulos.gerador_links import LinkSugerido
+from modulos.gerador_links import LinkSugerido, _e_fronteira_palavra
 from dataclasses import dataclass
 from modulos.conceitos import extrator_conceitos, Conceito
+from modulos.configuracao import configurador
 from modulos.similaridade import SimilaridadeUtils
 from unidecode import unidecode
 
 logger = logging.getLogger(__name__)
 
+# A partir destes números de notas o índice de títulos deixa de ser exaustivo:
+# IVF visita apenas `nprobe` células; IVF-PQ comprime também os vetores
+LIMIAR_INDICE_IVF = 1000
+LIMIAR_INDICE_IVFPQ = 50_000
+IVFPQ_SUBVETORES = 48      # Deve dividir a dimensão dos embeddings (384)
+
+MAX_CACHE_EMBEDDINGS = 50_000  # Embeddings de textos (títulos, termos, parágrafos) guardados em LRU
+
+# A partir deste número de notas os links de cada nota são gerados num pool de threads
+LIMIAR_GERACAO_PARALELA = 16
+
+_RE_SEPARADOR_PARAGRAFOS = re.compile(r'\n\n')
+_RE_TERMO_VALIDO = re.compile(r'[^\W_]*(?: [^\W_]*){0,3}')  # Alfanuméricos e no máximo 3 espaços
+_RE_PALAVRA_CONTEUDO = re.compile(r'\w{4,}')
+
+# Parágrafos com menos palavras distintas (de 4 ou mais letras) não passam pelo extrator de conceitos
+MIN_PALAVRAS_CONCEITOS_PARAGRAFO = 4
+
+try:
+    import ahocorasick
+    AHOCORASICK_DISPONIVEL = True
+except ImportError:
+    AHOCORASICK_DISPONIVEL = False
+
+try:
+    from numba import njit
+    NUMBA_DISPONIVEL = True
+except ImportError:
+    NUMBA_DISPONIVEL = False
+
+
+if NUMBA_DISPONIVEL:
+
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _melhor_cosseno(consulta, matriz):
+        """
+        Devolve a linha da matriz com maior produto interno com a consulta (versão compilada).
+
+        Para as poucas dezenas de candidatos de um parágrafo, um ciclo compilado
+        evita o custo de chamada do BLAS e liberta o GIL para o pool de threads.
+
+        Args:
+            consulta (np.ndarray): Vetor (d,) float32 normalizado.
+            matriz (np.ndarray): Matriz (n, d) float32 com linhas normalizadas (n > 0).
+
+        Returns:
+            Tuple[int, float]: Índice da melhor linha e o respetivo cosseno.
+        """
+        melhor = -np.inf
+        indice = 0
+        for i in range(matriz.shape[0]):
+            soma = 0.0
+            for j in range(matriz.shape[1]):
+                soma += consulta[j] * matriz[i, j]
+            if soma > melhor:
+                melhor = soma
+                indice = i
+        return indice, melhor
+
+
+@lru_cache(maxsize=1024)
+def _sem_acentos(texto: str) -> str:
+    """Texto em minúsculas e sem acentos; em cache porque a mesma nota é testada com vários termos."""
+    return unidecode(texto.lower())
+
+
+@lru_cache(maxsize=4096)
+def _compilar_padrao_termo(termo: str) -> re.Pattern:
+    """
+    Compila (com cache) o padrão de palavra inteira para um termo.
+
+    Args:
+        termo (str): Termo a procurar.
+
+    Returns:
+        re.Pattern: Padrão compilado, insensível a maiúsculas.
+    """
+    return re.compile(rf'\b{re.escape(termo)}\b', re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def _compilar_padrao_linkado(termo: str) -> re.Pattern:
+    """
+    Compila (com cache) o padrão de um link já aplicado ao termo ([[destino|termo]]).
+
+    Args:
+        termo (str): Termo mostrado no link.
+
+    Returns:
+        re.Pattern: Padrão compilado, insensível a maiúsculas.
+    """
+    return re.compile(rf"\[\[.*?\|{re.escape(termo)}\]\]", re.IGNORECASE)
+
 
 def termo_presente_em(texto: str, termo: str) -> bool:
     """
@@ -38,9 +140,7 @@ def termo_presente_em(texto: str, termo: str) -> bool:
     Returns:
         bool: True se o termo estiver presente no texto, False caso contrário.
     """
-    texto = unidecode(texto.lower())
-    termo = unidecode(termo.lower())
-    return termo in texto
+    return _sem_acentos(termo) in _sem_acentos(texto)
 
 class GeradorLinksSemanticos:
     """
@@ -55,10 +155,21 @@ class GeradorLinksSemanticos:
         Args:
             modelo_embeddings (str): Nome ou caminho do modelo da SentenceTransformer.
         """
-        self.modelo_embeddings = SentenceTransformer(modelo_embeddings)
+        self.modelo_embeddings = None
+        self.modelo_nome = modelo_embeddings
+        self._assinatura_modelo = modelo_embeddings  # Nome e quantização; faz parte da chave da cache
+        self._carregar_modelo(modelo_embeddings)
+        self._cache_embeddings: OrderedDict = OrderedDict()  # LRU: hash(modelo|texto) -> embedding
+        self._lock_embeddings = threading.Lock()  # Protege a cache LRU entre threads
+        self._lock_conceitos = threading.Lock()   # O extrator (spaCy e a sua cache) não é thread-safe
         self.indice_titulos: Optional[faiss.Index] = None
+        self._usar_gpu = getattr(faiss, "get_num_gpus", lambda: 0)() > 0  # FAISS compilado com CUDA e GPU presente
+        self._recursos_gpu = None  # StandardGpuResources; tem de viver tanto quanto o índice na GPU
         self.titulos_indexados: List[str] = []
         self.cache_links: Dict[str, List[LinkSugerido]] = {}
+        self._dados_notas: Dict[int, Dict] = {}  # id(nota) -> dados calculados uma vez por geração
+        self._notas_por_titulo: Dict[str, Dict] = {}
+        self._notas_indexadas: Optional[List[Dict]] = None  # Lista a que se refere _notas_por_titulo
 
         # Configurações padrão
         self.limiar_similaridade = 0.05
@@ -70,6 +181,33 @@ class GeradorLinksSemanticos:
         self.termos_genericos = extrator_conceitos.stopwords_personalizadas
 
 
+    def _carregar_modelo(self, nome: str):
+        """
+        Carrega o modelo de embeddings e, se configurado, quantiza-o para int8.
+
+        Com `performance.encoder_int8` ativo, as camadas lineares do modelo
+        passam por quantização dinâmica int8 do PyTorch, que acelera o encode
+        em CPU e reduz a memória. A opção é ignorada se o modelo estiver na GPU.
+
+        Args:
+            nome (str): Nome ou caminho do modelo da SentenceTransformer.
+        """
+        modelo = SentenceTransformer(nome)
+        assinatura = nome
+
+        if configurador.obter("performance", "encoder_int8", False):
+            try:
+                import torch
+                if modelo.device.type == "cpu":
+                    modelo = torch.quantization.quantize_dynamic(modelo, {torch.nn.Linear}, dtype=torch.qint8)
+                    assinatura = f"{nome}|int8"
+            except Exception as e:
+                logger.warning(f"Quantização int8 do modelo indisponível, a usar fp32: {e}")
+
+        self.modelo_embeddings = modelo
+        self.modelo_nome = nome
+        self._assinatura_modelo = assinatura
+
     def configurar_parametros(self, limiar_similaridade: float = 0.05, max_links_por_paragrafo: int = 3,
                               aplicar_apenas_primeira: bool = True, modo_semantico: bool = True):
         """
@@ -86,6 +224,72 @@ class GeradorLinksSemanticos:
         self.aplicar_apenas_primeira_ocorrencia = aplicar_apenas_primeira
         self.modo_semantico_ativo = modo_semantico
 
+    def _codificar_textos(self, textos: List[str]) -> np.ndarray:
+        """
+        Gera os embeddings de vários textos, reutilizando os que estão em cache.
+
+        Os mesmos títulos, termos e parágrafos são codificados muitas vezes ao
+        longo de uma geração de links. A cache LRU é indexada pelo hash do nome
+        do modelo (e da sua quantização) e do texto, para não devolver embeddings
+        de outro modelo.
+
+        Args:
+            textos (List[str]): Textos a codificar.
+
+        Returns:
+            np.ndarray: Matriz float32 com um embedding normalizado (L2) por texto.
+        """
+        cache = self._cache_embeddings
+        chaves = [
+            hashlib.blake2b(f"{self._assinatura_modelo}|{texto}".encode(), digest_size=16).digest()
+            for texto in textos
+        ]
+
+        em_cache, em_falta = {}, {}
+        with self._lock_embeddings:
+            for chave, texto in zip(chaves, textos):
+                embedding = cache.get(chave)
+                if embedding is not None:
+                    cache.move_to_end(chave)
+                    em_cache[chave] = embedding
+                else:
+                    em_falta.setdefault(chave, texto)
+
+        if em_falta:
+            novos = self._codificar_por_comprimento(list(em_falta.values()))
+            em_cache.update(zip(em_falta, novos))
+            with self._lock_embeddings:
+                cache.update(zip(em_falta, novos))
+                while len(cache) > MAX_CACHE_EMBEDDINGS:
+                    cache.popitem(last=False)
+
+        if not chaves:
+            return np.empty((0, 0), dtype='float32')
+        return np.stack([em_cache[chave] for chave in chaves])
+
+    def _codificar_por_comprimento(self, textos: List[str]) -> np.ndarray:
+        """
+        Gera os embeddings de vários textos, agrupando-os por comprimento.
+
+        Cada lote é preenchido até ao texto mais longo; ordenar por comprimento
+        junta textos semelhantes e reduz esse preenchimento. Os embeddings são
+        devolvidos na ordem original dos textos.
+
+        Args:
+            textos (List[str]): Textos a codificar.
+
+        Returns:
+            np.ndarray: Matriz float32 com um embedding normalizado (L2) por texto.
+        """
+        ordem = sorted(range(len(textos)), key=lambda i: len(textos[i]), reverse=True)
+        embeddings_ordenados = self.modelo_embeddings.encode(
+            [textos[i] for i in ordem], batch_size=64, show_progress_bar=False,
+            convert_to_numpy=True, normalize_embeddings=True
+        )
+        embeddings = np.empty_like(np.asarray(embeddings_ordenados, dtype='float32'))
+        embeddings[ordem] = embeddings_ordenados
+        return embeddings
+
     def criar_indice_titulos(self, notas: List[Dict]) -> bool:
         """
         Cria o índice vetorial FAISS com contexto enriquecido de cada nota.
@@ -107,8 +311,7 @@ class GeradorLinksSemanticos:
 
             if self.modelo_embeddings is None:
                 try:
-                    from sentence_transformers import SentenceTransformer
-                    self.modelo_embeddings = SentenceTransformer("sentence-transformers/multi-qa-MiniLM-L6-cos-v1")
+                    self._carregar_modelo("sentence-transformers/multi-qa-MiniLM-L6-cos-v1")
                     logger.info("Modelo de embeddings carregado com sucesso.")
                 except Exception as e:
                     logger.error(f"Erro ao carregar modelo de embeddings: {e}")
@@ -118,15 +321,17 @@ class GeradorLinksSemanticos:
             self.mapeamento_titulos = {}  # ID numérico para título
             self.ids_indexados = []       # IDs na ordem dos embeddings
 
+            # Notas com título válido, como pares (conteúdo, título) para extrair conceitos em lote
+            validas = []
             for idx, nota in enumerate(notas):
                 titulo = nota.get('titulo', '').strip()
-                conteudo = nota.get('conteudo', '').strip()
+                if titulo and len(titulo) >= 3:
+                    validas.append((idx, (nota.get('conteudo', '').strip(), titulo)))
 
-                if not titulo or len(titulo) < 3:
-                    continue
-
-                palavras_chave = extrator_conceitos.extrair_conceitos_avancados(conteudo, titulo)
+            processos = int(configurador.obter("performance", "threads_processamento", 1) or 1)
+            conceitos_por_nota = extrator_conceitos.extrair_conceitos_lote([par for _, par in validas], processos)
 
+            for (idx, (conteudo, titulo)), palavras_chave in zip(validas, conceitos_por_nota):
                 termos_validos = []
                 for c in palavras_chave:
                     if isinstance(c, Conceito):
@@ -145,12 +350,9 @@ class GeradorLinksSemanticos:
             if not textos_contexto:
                 return False
 
-            embeddings = self.modelo_embeddings.encode(textos_contexto)
-            embeddings = np.asarray(embeddings, dtype='float32')
+            embeddings = self._codificar_textos(textos_contexto)
 
-            dimensao = embeddings.shape[1]
-            self.indice_titulos = faiss.IndexFlatL2(dimensao)
-            self.indice_titulos.add(embeddings)
+            self.indice_titulos = self._construir_indice(embeddings)
 
             logger.info(f"Índice semântico criado com {len(textos_contexto)} notas.")
             return True
@@ -159,6 +361,71 @@ class GeradorLinksSemanticos:
             logger.error(f"Erro ao criar índice de títulos: {e}")
             return False
 
+    def _construir_indice(self, embeddings: np.ndarray) -> faiss.Index:
+        """
+        Constrói o índice FAISS de produto interno (cosseno) para os embeddings.
+
+        Com menos de `LIMIAR_INDICE_IVF` notas a busca exaustiva é a mais rápida.
+        Acima disso usa-se IVF, que visita apenas `nprobe` células por busca, e a
+        partir de `LIMIAR_INDICE_IVFPQ` os vetores são também comprimidos (PQ).
+        Com `embeddings.quantizacao = "sq8"` os vetores dos índices sem PQ são
+        guardados com 8 bits por dimensão (4x menos memória a percorrer).
+        Havendo uma GPU, o índice final é copiado para ela.
+
+        Args:
+            embeddings (np.ndarray): Matriz float32 contígua, com linhas normalizadas (L2).
+
+        Returns:
+            faiss.Index: Índice treinado e com os embeddings adicionados.
+        """
+        n, dimensao = embeddings.shape
+        sq8 = configurador.obter("embeddings", "quantizacao", "fp32") == "sq8"
+        nlist = max(1, int(4 * math.sqrt(n)))
+
+        if n < LIMIAR_INDICE_IVF:
+            descricao = "SQ8" if sq8 else "Flat"
+        elif n >= LIMIAR_INDICE_IVFPQ and dimensao % IVFPQ_SUBVETORES == 0:
+            descricao = f"IVF{nlist},PQ{IVFPQ_SUBVETORES}x8"
+        else:
+            descricao = f"IVF{nlist},SQ8" if sq8 else f"IVF{nlist},Flat"
+
+        indice = faiss.index_factory(dimensao, descricao, faiss.METRIC_INNER_PRODUCT)
+        if not indice.is_trained:
+            indice.train(embeddings)
+        indice.add(embeddings)
+        if n >= LIMIAR_INDICE_IVF:
+            indice.nprobe = max(1, nlist // 16)
+        return self._mover_para_gpu(indice, quantizado="SQ" in descricao or "PQ" in descricao)
+
+    def _mover_para_gpu(self, indice: faiss.Index, quantizado: bool = False) -> faiss.Index:
+        """
+        Copia o índice para a GPU, quando existe uma disponível.
+
+        Os índices quantizados (SQ/PQ) são copiados com `useFloat16`, necessário
+        para as tabelas de PQ com muitos subvetores caberem na memória partilhada.
+        Se a cópia falhar, o índice continua na CPU e as tentativas seguintes são
+        desativadas.
+
+        Args:
+            indice (faiss.Index): Índice construído na CPU (com `nprobe` já definido).
+            quantizado (bool): Se o índice guarda vetores comprimidos.
+
+        Returns:
+            faiss.Index: Índice na GPU, ou o original se não for possível movê-lo.
+        """
+        if not self._usar_gpu:
+            return indice
+        try:
+            if self._recursos_gpu is None:
+                self._recursos_gpu = faiss.StandardGpuResources()
+            opcoes = faiss.GpuClonerOptions()
+            opcoes.useFloat16 = quantizado
+            return faiss.index_cpu_to_gpu(self._recursos_gpu, 0, indice, opcoes)
+        except Exception as e:
+            logger.warning("Não foi possível mover o índice FAISS para a GPU, usando CPU: %s", e)
+            self._usar_gpu = False
+            return indice
+
     def gerar_links_sugeridos(self, notas: List[Dict]) -> Dict[str, List[LinkSugerido]]:
         """
         Gera links sugeridos para todas as notas fornecidas, combinando:
@@ -173,29 +440,72 @@ class GeradorLinksSemanticos:
                                            e lista de links sugeridos como valor.
         """
         links_por_nota = {}
+        self._dados_notas = {}
+        self._notas_indexadas = None
+
+        # Todos os parágrafos de todas as notas são procurados no índice de uma só vez
+        similares_por_nota = [None] * len(notas)
+        if self.modo_semantico_ativo and self.indice_titulos:
+            paragrafos_por_nota = [self._paragrafos_semanticos(nota['conteudo']) for nota in notas]
+            todos_paragrafos = [p for paragrafos in paragrafos_por_nota for _, p in paragrafos]
+            similares = iter(self._buscar_titulos_similares_lote(todos_paragrafos))
+            similares_por_nota = [
+                [(inicio, p, next(similares)) for inicio, p in paragrafos] for paragrafos in paragrafos_por_nota
+            ]
+
+        def gerar(nota: Dict, similares_paragrafos) -> List[LinkSugerido]:
+            return self._gerar_links_nota(nota, notas, similares_paragrafos)
+
+        if len(notas) >= LIMIAR_GERACAO_PARALELA:
+            # Conceitos e dicionário de títulos são preparados antes, fora das threads
+            for nota in notas:
+                self._dados_nota(nota)
+            self._indexar_titulos(notas)
+
+            # Encode, busca FAISS, regex e numpy libertam o GIL
+            with ThreadPoolExecutor(max_workers=min(16, os.cpu_count() or 1)) as executor:
+                resultados = list(executor.map(gerar, notas, similares_por_nota))
+        else:
+            resultados = list(map(gerar, notas, similares_por_nota))
+
+        for nota, links_filtrados in zip(notas, resultados):
+            links_por_nota[nota['titulo']] = links_filtrados
 
-        for nota in notas:
-            titulo_nota = nota['titulo']
-            links_nota = []
+        return links_por_nota
 
-            # 1. Links literais
-            links_literais = self._gerar_links_literais(nota, notas)
-            links_nota.extend(links_literais)
+    def _gerar_links_nota(self, nota: Dict, todas_notas: List[Dict],
+                          similares_paragrafos: Optional[List[Tuple[int, str, List[Tuple[str, float]]]]]
+                          ) -> List[LinkSugerido]:
+        """
+        Gera, filtra e prioriza os links literais e semânticos de uma nota.
 
-            # 2. Links semânticos (se ativo)
-            links_semanticos = []
-            if self.modo_semantico_ativo and self.indice_titulos:
-                links_semanticos = self._gerar_links_semanticos(nota, notas)
-                links_nota.extend(links_semanticos)
+        Args:
+            nota (Dict): Nota de origem.
+            todas_notas (List[Dict]): Lista de todas as notas do sistema.
+            similares_paragrafos (Optional[List[Tuple[int, str, List[Tuple[str, float]]]]]): Títulos
+                similares de cada parágrafo, já calculados em lote.
 
-            # 3. Filtragem e priorização
-            links_filtrados = self._filtrar_links(links_nota, nota['conteudo'])
-            links_por_nota[titulo_nota] = links_filtrados
+        Returns:
+            List[LinkSugerido]: Links filtrados da nota.
+        """
+        titulo_nota = nota['titulo']
+        links_nota = []
 
-            logger.debug(f"[{titulo_nota}] Links literais gerados: {len(links_literais)}")
-            logger.debug(f"[{titulo_nota}] Links semânticos gerados: {len(links_semanticos)}")
+        # 1. Links literais
+        links_literais = self._gerar_links_literais(nota, todas_notas)
+        links_nota.extend(links_literais)
 
-        return links_por_nota
+        # 2. Links semânticos (se ativo)
+        links_semanticos = []
+        if self.modo_semantico_ativo and self.indice_titulos:
+            links_semanticos = self._gerar_links_semanticos(nota, todas_notas, similares_paragrafos)
+            links_nota.extend(links_semanticos)
+
+        logger.debug(f"[{titulo_nota}] Links literais gerados: {len(links_literais)}")
+        logger.debug(f"[{titulo_nota}] Links semânticos gerados: {len(links_semanticos)}")
+
+        # 3. Filtragem e priorização
+        return self._filtrar_links(links_nota, nota['conteudo'])
 
     def _gerar_links_literais(self, nota: Dict, todas_notas: List[Dict]) -> List[LinkSugerido]:
         """
@@ -212,15 +522,15 @@ class GeradorLinksSemanticos:
         conteudo = nota['conteudo']
         titulo_atual = nota['titulo']
 
-        conceitos_nota = extrator_conceitos.extrair_conceitos_avancados(conteudo, titulo_atual)
+        conceitos_nota = [
+            c for c in self._dados_nota(nota)['conceitos'] if c.termo.lower() not in self.termos_genericos
+        ]
+        posicoes_por_termo = self._encontrar_posicoes_termos([c.termo for c in conceitos_nota], conteudo)
 
         for conceito in conceitos_nota:
             termo = conceito.termo
 
-            if termo.lower() in self.termos_genericos:
-                continue
-
-            posicoes = self._encontrar_posicoes_termo(termo, conteudo)
+            posicoes = posicoes_por_termo[termo]
             if not posicoes:
                 continue
 
@@ -243,28 +553,6 @@ class GeradorLinksSemanticos:
 
         return links
 
-
-    def _encontrar_mais_proximo(self, termo: str, candidatos: List[str]) -> Tuple[str, float]:
-        """
-        Encontra o candidato semanticamente mais próximo ao termo dado.
-        Retorna uma tupla (termo_mais_proximo, score).
-        """
-        if not candidatos or not self.modelo_embeddings:
-            return "", 0.0
-
-        try:
-            emb_termo = self.modelo_embeddings.encode([termo])[0]
-            emb_candidatos = self.modelo_embeddings.encode(candidatos)
-
-            scores = [SimilaridadeUtils.similaridade(emb_termo, emb) for emb in emb_candidatos]
-            idx_max = int(np.argmax(scores))
-
-            return candidatos[idx_max], float(scores[idx_max])
-        
-        except Exception as e:
-            logger.warning(f"Erro ao encontrar termo mais próximo: {e}")
-            return "", 0.0
-
     def _encontrar_mais_proximo(self, termo: str, candidatos: List[str]) -> Tuple[str, float]:
         """
         Encontra o candidato semanticamente mais próximo ao termo fornecido.
@@ -276,12 +564,20 @@ class GeradorLinksSemanticos:
         Returns:
             Tuple[str, float]: Tupla com o termo mais próximo e o respetivo score de similaridade.
         """
+        if not candidatos:
+            return "", 0.0
+
         try:
-            emb_termo = self.modelo_embeddings.encode([termo])[0]
-            emb_candidatos = self.modelo_embeddings.encode(candidatos)
+            embeddings = self._codificar_textos([termo] + candidatos)
+            emb_termo, emb_candidatos = embeddings[0], embeddings[1:]
+
+            # Embeddings normalizados: o cosseno é o produto interno (arredondado como em SimilaridadeUtils)
+            if NUMBA_DISPONIVEL:
+                idx_max, score = _melhor_cosseno(emb_termo, emb_candidatos)
+                return candidatos[idx_max], round(float(score), 4)
 
-            scores = [SimilaridadeUtils.similaridade(emb_termo, emb) for emb in emb_candidatos]
-            idx_max = int(np.argmax(scores))
+            scores = np.round(emb_candidatos @ emb_termo, 4)
+            idx_max = int(scores.argmax())
 
             return candidatos[idx_max], float(scores[idx_max])
 
@@ -301,21 +597,27 @@ class GeradorLinksSemanticos:
         Returns:
             List[str]: Lista de termos de 'origem' considerados semanticamente próximos.
         """
-        resultados = []
+        if not origem or not destino:
+            return []
+
         try:
-            emb_origem = self.modelo_embeddings.encode(origem)
-            emb_destino = self.modelo_embeddings.encode(destino)
-
-            for i, vetor_o in enumerate(emb_origem):
-                termo_o = origem[i]
-                for j, vetor_d in enumerate(emb_destino):
-                    termo_d = destino[j]
-                    score = SimilaridadeUtils.similaridade(vetor_o, vetor_d)
-                    if score >= self.limiar_similaridade:
-                        resultados.append(termo_o)
-                        break  # Evita repetições excessivas
+            # Um termo que também existe em 'destino' tem similaridade 1 consigo mesmo:
+            # só os restantes precisam de embeddings
+            termos_destino = set(destino)
+            residuais = [t for t in dict.fromkeys(origem) if t not in termos_destino]
+            semelhantes = set()
+
+            if residuais:
+                embeddings = self._codificar_textos(residuais + destino)
+                emb_residuais, emb_destino = embeddings[:len(residuais)], embeddings[len(residuais):]
+
+                # Todas as similaridades residuais x destino numa única multiplicação de matrizes
+                scores = SimilaridadeUtils.similaridade_matriz(emb_residuais, emb_destino)
+                proximos = (scores.round(4) >= self.limiar_similaridade).any(axis=1)
+                semelhantes = {residuais[i] for i in np.flatnonzero(proximos)}
 
-            return list(set(resultados))
+            # Sem repetições, pela ordem de 'origem'
+            return list(dict.fromkeys(t for t in origem if t in termos_destino or t in semelhantes))
 
         except Exception as e:
             logger.warning(f"Erro ao calcular similaridade unilateral: {e}")
@@ -338,13 +640,60 @@ class GeradorLinksSemanticos:
             ngrams += [' '.join(tokens[i:i+n]) for i in range(len(tokens) - n + 1)]
         return ngrams
 
-    def _gerar_links_semanticos(self, nota: Dict, todas_notas: List[Dict]) -> List[LinkSugerido]:
+    def _paragrafos_semanticos(self, conteudo: str) -> List[Tuple[int, str]]:
+        """
+        Devolve os parágrafos de uma nota com texto suficiente para a busca semântica.
+
+        Args:
+            conteudo (str): Texto completo da nota.
+
+        Returns:
+            List[Tuple[int, str]]: Pares (posição inicial no conteúdo, parágrafo sem
+            espaços nas pontas), para parágrafos com pelo menos 3 palavras.
+        """
+        paragrafos = []
+        inicio = 0
+        for bloco in conteudo.split('\n\n'):
+            paragrafo = bloco.strip()
+            if len(paragrafo.split()) >= 3:
+                paragrafos.append((inicio + len(bloco) - len(bloco.lstrip()), paragrafo))
+            inicio += len(bloco) + 2
+        return paragrafos
+
+    def _termos_paragrafo(self, paragrafo: str, titulo: str) -> List[str]:
+        """
+        Extrai os termos (com mais de 2 caracteres) de um parágrafo.
+
+        Parágrafos curtos ou só com palavras genéricas raramente produzem
+        conceitos úteis; uma contagem barata de palavras evita chamar o
+        extrator nesses casos.
+
+        Args:
+            paragrafo (str): Parágrafo da nota.
+            titulo (str): Título da nota (chave do cache do extrator).
+
+        Returns:
+            List[str]: Termos do parágrafo, ou lista vazia se o parágrafo for descartado.
+        """
+        palavras = set(_RE_PALAVRA_CONTEUDO.findall(paragrafo.lower()))
+        if len(palavras) < MIN_PALAVRAS_CONCEITOS_PARAGRAFO or palavras <= self.termos_genericos:
+            return []
+
+        with self._lock_conceitos:
+            conceitos = extrator_conceitos.extrair_conceitos_avancados(paragrafo, titulo)
+        return [c.termo for c in conceitos if len(c.termo) > 2]
+
+    def _gerar_links_semanticos(self, nota: Dict, todas_notas: List[Dict],
+                                similares_paragrafos: Optional[List[Tuple[int, str, List[Tuple[str, float]]]]] = None
+                                ) -> List[LinkSugerido]:
         """
         Gera links entre parágrafos da nota e outras notas com base em similaridade semântica.
 
         Args:
             nota (Dict): Nota atual em análise.
             todas_notas (List[Dict]): Lista completa de notas.
+            similares_paragrafos (Optional[List[Tuple[int, str, List[Tuple[str, float]]]]]): Tuplos
+                (posição, parágrafo, títulos similares) já calculados em lote; se omitido, são calculados aqui.
 
         Returns:
             List[LinkSugerido]: Lista de links sugeridos do tipo semântico.
@@ -356,13 +705,13 @@ class GeradorLinksSemanticos:
 
         conteudo = nota['conteudo']
         titulo_atual = nota['titulo']
-        paragrafos = [p.strip() for p in conteudo.split('\n\n') if p.strip()]
-
-        for paragrafo in paragrafos:
-            if len(paragrafo.split()) < 3:
-                continue
+        if similares_paragrafos is None:
+            paragrafos = self._paragrafos_semanticos(conteudo)
+            similares = self._buscar_titulos_similares_lote([p for _, p in paragrafos])
+            similares_paragrafos = [(inicio, p, s) for (inicio, p), s in zip(paragrafos, similares)]
 
-            titulos_similares = self._buscar_titulos_similares(paragrafo)
+        for inicio_paragrafo, paragrafo, titulos_similares in similares_paragrafos:
+            termos_paragrafo = None  # Extraídos uma vez por parágrafo, só se houver nota similar
 
             for titulo_similar, score in titulos_similares:
                 if titulo_similar == titulo_atual:
@@ -372,29 +721,25 @@ class GeradorLinksSemanticos:
                 if not nota_similar:
                     continue
 
-                conceitos_paragrafo = extrator_conceitos.extrair_conceitos_avancados(paragrafo, titulo_atual)
-                conceitos_similar = extrator_conceitos.extrair_conceitos_avancados(
-                    nota_similar['conteudo'], nota_similar['titulo']
-                )
-
-                termos_paragrafo = [c.termo for c in conceitos_paragrafo if len(c.termo) > 2]
-                termos_similar = [c.termo for c in conceitos_similar if len(c.termo) > 2]
+                if termos_paragrafo is None:
+                    termos_paragrafo = self._termos_paragrafo(paragrafo, titulo_atual)
+                if not termos_paragrafo:
+                    break
+                termos_similar = self._dados_nota(nota_similar)['termos_validos']
 
                 termos_semanticos = self._encontrar_termos_semanticos_unilaterais(termos_similar, termos_paragrafo)
 
-                for termo in termos_semanticos:
-                    if not termo or len(termo.strip()) < 3:
-                        continue
-                    if any(c in termo for c in ['_', '/', '\\']):
-                        continue
-                    if termo.count(" ") > 3:
-                        continue
-                    if not termo.replace(" ", "").isalnum():
-                        continue
-
-                    if not termo_presente_em(nota['conteudo'], termo) and not termo_presente_em(nota_similar['conteudo'], termo):
-                        continue
+                # Termos com pelo menos 3 caracteres, só alfanuméricos e até 4 palavras,
+                # presentes (sem acentos nem caixa) numa das duas notas
+                conteudo_normalizado = self._dados_nota(nota)['conteudo_normalizado']
+                similar_normalizado = self._dados_nota(nota_similar)['conteudo_normalizado']
+                termos_semanticos = [
+                    termo for termo in termos_semanticos
+                    if len(termo.strip()) >= 3 and _RE_TERMO_VALIDO.fullmatch(termo)
+                    and (_sem_acentos(termo) in conteudo_normalizado or _sem_acentos(termo) in similar_normalizado)
+                ]
 
+                for termo in termos_semanticos:
                     posicoes = self._encontrar_posicoes_termo(termo, conteudo)
 
                     if posicoes:
@@ -416,7 +761,7 @@ class GeradorLinksSemanticos:
                         if sim_score >= 0.80:
                             pos_local = paragrafo.lower().find(termo_similar.lower())
                             if pos_local >= 0:
-                                posicao = conteudo.find(paragrafo) + pos_local
+                                posicao = inicio_paragrafo + pos_local
                                 contexto = self._extrair_contexto(conteudo, posicao, termo_similar)
                                 links.append(LinkSugerido(
                                     termo=termo,
@@ -440,50 +785,6 @@ class GeradorLinksSemanticos:
                             ))
 
         return links
-    
-    def _buscar_titulos_similares(self, texto: str, top_k: int = 3) -> List[Tuple[str, float]]:
-        """Busca títulos similares a um texto usando FAISS."""
-        try:
-            if not self.indice_titulos or not self.mapeamento_titulos:
-                print("⚠️ Índice ou dados de títulos não inicializados.")
-                return []
-
-            embedding_texto = self.modelo_embeddings.encode([texto])
-            embedding_texto = np.asarray(embedding_texto).astype('float32')
-
-            distancias, indices = self.indice_titulos.search(embedding_texto, top_k)
-
-            resultados = []
-            for i in range(top_k):
-                try:
-                    distancia = float(distancias[0][i])
-                    indice_faiss = int(indices[0][i])
-
-                    print(f"🔎 Índice FAISS: {indice_faiss} (tipo={type(indice_faiss)}), Distância: {distancia}")
-
-                    # Verificar se FAISS retornou um índice válido
-                    if indice_faiss == -1 or indice_faiss not in self.mapeamento_titulos:
-                        print(f"⚠️ Índice FAISS fora de alcance: {indice_faiss}")
-                        continue
-
-                    titulo = self.mapeamento_titulos[indice_faiss]
-                    score = 1.0 / (1.0 + distancia)
-
-                    status = "✅" if score >= self.limiar_similaridade else "❌"
-                    print(f"{status} {titulo} (score={score:.4f}, dist={distancia:.2f})")
-
-                    if score >= self.limiar_similaridade:
-                        resultados.append((titulo, score))
-
-                except Exception as e:
-                    print(f"❌ Erro ao processar resultado {i}: {e}")
-                    continue
-
-            return resultados
-
-        except Exception as e:
-            print(f"❌ Erro geral na busca de títulos similares: {e}")
-            return []
 
     def _buscar_titulos_similares(self, texto: str, top_k: int = 3) -> List[Tuple[str, float]]:
         """
@@ -496,37 +797,53 @@ class GeradorLinksSemanticos:
         Returns:
             List[Tuple[str, float]]: Lista de tuplas (título, score de similaridade).
         """
+        return self._buscar_titulos_similares_lote([texto], top_k)[0]
+
+    def _buscar_titulos_similares_lote(self, textos: List[str], top_k: int = 3) -> List[List[Tuple[str, float]]]:
+        """
+        Busca os títulos similares a vários textos com um único encode e uma única busca FAISS.
+
+        Args:
+            textos (List[str]): Textos de entrada para comparação.
+            top_k (int): Número de resultados mais próximos a retornar por texto.
+
+        Returns:
+            List[List[Tuple[str, float]]]: Para cada texto, lista de tuplas (título, score de similaridade).
+        """
+        if not textos:
+            return []
+
         try:
             if not self.indice_titulos or not self.mapeamento_titulos:
-                return []
+                return [[] for _ in textos]
 
-            embedding_texto = self.modelo_embeddings.encode([texto])
-            embedding_texto = np.asarray(embedding_texto).astype('float32')
+            embeddings = self._codificar_textos(textos)
 
-            distancias, indices = self.indice_titulos.search(embedding_texto, top_k)
+            distancias, indices = self.indice_titulos.search(embeddings, top_k)
 
+            depurar = logger.isEnabledFor(logging.DEBUG)
             resultados = []
-            for i in range(top_k):
-                try:
-                    distancia = float(distancias[0][i])
-                    indice_faiss = int(indices[0][i])
-
+            for linha_distancias, linha_indices in zip(distancias.tolist(), indices.tolist()):
+                similares = []
+                for score, indice_faiss in zip(linha_distancias, linha_indices):
                     if indice_faiss == -1 or indice_faiss not in self.mapeamento_titulos:
+                        if depurar:
+                            logger.debug("Índice FAISS fora de alcance: %s", indice_faiss)
                         continue
 
-                    titulo = self.mapeamento_titulos[indice_faiss]
-                    score = 1.0 / (1.0 + distancia)
-
+                    # Produto interno de vetores normalizados = cosseno
                     if score >= self.limiar_similaridade:
-                        resultados.append((titulo, score))
-
-                except Exception as e:
-                    continue
+                        similares.append((self.mapeamento_titulos[indice_faiss], score))
+                    elif depurar:
+                        logger.debug("Abaixo do limiar: %s (score=%.4f)",
+                                     self.mapeamento_titulos[indice_faiss], score)
+                resultados.append(similares)
 
             return resultados
 
         except Exception as e:
-            return []
+            logger.warning(f"Erro na busca de títulos similares: {e}")
+            return [[] for _ in textos]
 
     def _termo_relevante_em_nota(self, termo: str, nota: Dict) -> bool:
         """
@@ -539,17 +856,42 @@ class GeradorLinksSemanticos:
         Returns:
             bool: True se o termo estiver presente como conceito ou no título.
         """
-        titulo = nota['titulo'].lower()
-        conteudo = nota['conteudo'].lower()
+        dados = self._dados_nota(nota)
         termo_lower = termo.lower()
 
-        if termo_lower in titulo:
-            return True
+        return termo_lower in dados['titulo_lower'] or termo_lower in dados['termos_lower']
 
-        conceitos_nota = extrator_conceitos.extrair_conceitos_avancados(nota['conteudo'])
-        termos_nota = {c.termo.lower() for c in conceitos_nota}
+    def _dados_nota(self, nota: Dict) -> Dict:
+        """
+        Devolve os dados de uma nota usados repetidamente na geração de links.
 
-        return termo_lower in termos_nota
+        Os conceitos, o título em minúsculas e o conteúdo sem acentos são
+        calculados na primeira consulta e reutilizados até à próxima chamada de
+        `gerar_links_sugeridos`, em vez de uma vez por par (conceito, nota).
+
+        Args:
+            nota (Dict): Nota com 'titulo' e 'conteudo'.
+
+        Returns:
+            Dict: Dicionário com 'conceitos', 'termos_lower', 'termos_validos' (mais de 2
+            caracteres), 'titulo_lower' e 'conteudo_normalizado'.
+        """
+        dados = self._dados_notas.get(id(nota))
+        if dados is not None and dados['nota'] is nota:
+            return dados
+
+        with self._lock_conceitos:
+            conceitos = extrator_conceitos.extrair_conceitos_avancados(nota['conteudo'], nota['titulo'])
+        dados = {
+            'nota': nota,
+            'conceitos': conceitos,
+            'termos_lower': frozenset(c.termo.lower() for c in conceitos),
+            'termos_validos': [c.termo for c in conceitos if len(c.termo) > 2],
+            'titulo_lower': nota['titulo'].lower(),
+            'conteudo_normalizado': _sem_acentos(nota['conteudo']),
+        }
+        self._dados_notas[id(nota)] = dados
+        return dados
 
     def _encontrar_posicoes_termo(self, termo: str, conteudo: str) -> List[int]:
         """
@@ -562,11 +904,57 @@ class GeradorLinksSemanticos:
         Returns:
             List[int]: Lista de posições iniciais de ocorrência.
         """
-        posicoes = []
-        padrao = rf'\b{re.escape(termo)}\b'
+        return [match.start() for match in _compilar_padrao_termo(termo).finditer(conteudo)]
+
+    def _encontrar_posicoes_termos(self, termos: List[str], conteudo: str) -> Dict[str, List[int]]:
+        """
+        Encontra as posições de vários termos no conteúdo, numa única passagem.
 
-        for match in re.finditer(padrao, conteudo, re.IGNORECASE):
-            posicoes.append(match.start())
+        Com `pyahocorasick` disponível, um autómato com todos os termos percorre
+        o conteúdo uma só vez. As fronteiras de palavra e a não sobreposição de
+        ocorrências do mesmo termo seguem a semântica de `_encontrar_posicoes_termo`.
+        Termos cuja conversão para minúsculas muda o comprimento são procurados
+        individualmente.
+
+        Args:
+            termos (List[str]): Termos a localizar.
+            conteudo (str): Texto completo onde procurar.
+
+        Returns:
+            Dict[str, List[int]]: Para cada termo, lista de posições iniciais de ocorrência.
+        """
+        minusculo = conteudo.lower()
+        if not AHOCORASICK_DISPONIVEL or len(minusculo) != len(conteudo):
+            return {termo: self._encontrar_posicoes_termo(termo, conteudo) for termo in termos}
+
+        posicoes: Dict[str, List[int]] = {}
+        por_minusculas: Dict[str, List[str]] = {}
+        for termo in termos:
+            termo_minusculo = termo.lower()
+            if termo and len(termo_minusculo) == len(termo):
+                por_minusculas.setdefault(termo_minusculo, []).append(termo)
+            else:
+                posicoes[termo] = self._encontrar_posicoes_termo(termo, conteudo)
+
+        if por_minusculas:
+            automato = ahocorasick.Automaton()
+            for termo_minusculo in por_minusculas:
+                automato.add_word(termo_minusculo, termo_minusculo)
+            automato.make_automaton()
+
+            encontradas: Dict[str, List[int]] = {t: [] for t in por_minusculas}
+            fim_anterior: Dict[str, int] = {}
+            for ultimo, termo_minusculo in automato.iter(minusculo):
+                inicio, fim = ultimo - len(termo_minusculo) + 1, ultimo + 1
+                if inicio < fim_anterior.get(termo_minusculo, 0):
+                    continue  # Sobrepõe-se à ocorrência anterior do mesmo termo
+                if _e_fronteira_palavra(conteudo, inicio) and _e_fronteira_palavra(conteudo, fim):
+                    encontradas[termo_minusculo].append(inicio)
+                    fim_anterior[termo_minusculo] = fim
+
+            for termo_minusculo, lista in por_minusculas.items():
+                for termo in lista:
+                    posicoes[termo] = encontradas[termo_minusculo]
 
         return posicoes
 
@@ -593,13 +981,6 @@ class GeradorLinksSemanticos:
 
         return contexto
 
-    def _encontrar_nota_por_titulo(self, titulo: str, notas: List[Dict]) -> Optional[Dict]:
-        """Encontra uma nota pelo título."""
-        for nota in notas:
-            if nota['titulo'] == titulo:
-                return nota
-        return None
-    
     def _encontrar_nota_por_titulo(self, titulo: str, notas: List[Dict]) -> Optional[Dict]:
         """
         Procura uma nota com base no título exato.
@@ -611,10 +992,23 @@ class GeradorLinksSemanticos:
         Returns:
             Optional[Dict]: Nota encontrada, ou None se não existir.
         """
-        for nota in notas:
-            if nota['titulo'] == titulo:
-                return nota
-        return None
+        self._indexar_titulos(notas)
+        return self._notas_por_titulo.get(titulo)
+
+    def _indexar_titulos(self, notas: List[Dict]):
+        """
+        Constrói o dicionário título -> nota, uma vez por lista de notas.
+
+        Com títulos repetidos, mantém-se a primeira nota.
+
+        Args:
+            notas (List[Dict]): Lista de todas as notas disponíveis.
+        """
+        if self._notas_indexadas is not notas:
+            self._notas_por_titulo = {}
+            for nota in notas:
+                self._notas_por_titulo.setdefault(nota['titulo'], nota)
+            self._notas_indexadas = notas
 
     def _filtrar_links(self, links: List[LinkSugerido], conteudo: str) -> List[LinkSugerido]:
         """
@@ -629,13 +1023,14 @@ class GeradorLinksSemanticos:
         """
         links_por_paragrafo = {}
         links_sem_posicao = []
+        fins_separadores = [m.end() for m in _RE_SEPARADOR_PARAGRAFOS.finditer(conteudo)]
 
         for link in links:
             if link.posicao_inicio < 0:
                 links_sem_posicao.append(link)
                 continue
 
-            num_paragrafo = self._encontrar_paragrafo(link.posicao_inicio, conteudo)
+            num_paragrafo = self._encontrar_paragrafo(link.posicao_inicio, fins_separadores)
 
             if num_paragrafo not in links_por_paragrafo:
                 links_por_paragrafo[num_paragrafo] = []
@@ -660,24 +1055,29 @@ class GeradorLinksSemanticos:
 
         return links_filtrados + links_sem_posicao
 
-    def _encontrar_paragrafo(self, posicao: int, conteudo: str) -> int:
+    def _encontrar_paragrafo(self, posicao: int, fins_separadores: List[int]) -> int:
         """
         Determina o número do parágrafo a partir da posição no texto.
 
         Args:
             posicao (int): Posição absoluta no conteúdo.
-            conteudo (str): Texto completo da nota.
+            fins_separadores (List[int]): Posições finais (crescentes) dos separadores
+                '\\n\\n' do conteúdo, calculadas uma vez por nota.
 
         Returns:
-            int: Índice do parágrafo.
+            int: Índice do parágrafo (número de separadores antes da posição).
         """
-        texto_ate_posicao = conteudo[:posicao]
-        return texto_ate_posicao.count('\n\n')
+        return bisect_right(fins_separadores, posicao)
 
     def aplicar_links_em_memoria(self, conteudo: str, sugestoes: List[LinkSugerido]) -> str:
         """
         Aplica os links sugeridos no conteúdo textual de forma segura.
 
+        As sugestões são tratadas por ordem decrescente de score e cada uma liga a
+        primeira ocorrência do termo que não esteja dentro de um link já aplicado.
+        As posições referem-se sempre ao texto original, que é reconstruído uma
+        única vez no fim.
+
         Args:
             conteudo (str): Texto original da nota.
             sugestoes (List[LinkSugerido]): Lista de sugestões de links.
@@ -686,7 +1086,10 @@ class GeradorLinksSemanticos:
             str: Conteúdo com links aplicados.
         """
         try:
-            conteudo_modificado = conteudo
+            # Trechos do conteúdo original já substituídos por links: (início, fim, link)
+            aplicados: List[Tuple[int, int, str]] = []
+            inicios: List[int] = []
+            termos_linkados = set()
             usados = set()
 
             for sugestao in sorted(sugestoes, key=lambda s: s.score_similaridade, reverse=True):
@@ -694,15 +1097,22 @@ class GeradorLinksSemanticos:
                 destino = sugestao.nota_destino
                 chave = (termo.lower(), destino.lower())
 
-                if chave in usados:
+                if chave in usados or chave[0] in termos_linkados:
                     continue
 
-                padrao_linkado = re.compile(rf"\[\[.*?\|{re.escape(termo)}\]\]", re.IGNORECASE)
-                if padrao_linkado.search(conteudo_modificado):
+                if _compilar_padrao_linkado(termo).search(conteudo):
                     continue
 
-                padrao = re.compile(rf"\b{re.escape(termo)}\b", re.IGNORECASE)
-                match = padrao.search(conteudo_modificado)
+                # Primeira ocorrência que não se sobrepõe a um link já aplicado
+                padrao = _compilar_padrao_termo(termo)
+                match = padrao.search(conteudo)
+                while match:
+                    i = bisect_right(inicios, match.start())
+                    livre_antes = i == 0 or aplicados[i - 1][1] <= match.start()
+                    livre_depois = i == len(inicios) or match.end() <= inicios[i]
+                    if livre_antes and livre_depois:
+                        break
+                    match = padrao.search(conteudo, match.start() + 1)
                 if not match:
                     continue
 
@@ -712,13 +1122,20 @@ class GeradorLinksSemanticos:
                 else:
                     link = f"[[{destino}|{termo_encontrado}]]"
 
-                conteudo_modificado = (
-                    conteudo_modificado[:match.start()] + link + conteudo_modificado[match.end():]
-                )
-
+                aplicados.insert(i, (match.start(), match.end(), link))
+                inicios.insert(i, match.start())
+                termos_linkados.add(chave[0])
                 usados.add(chave)
 
-            return conteudo_modificado
+            # O texto final é montado uma única vez a partir dos trechos originais
+            partes = []
+            anterior = 0
+            for inicio, fim, link in aplicados:
+                partes.append(conteudo[anterior:inicio])
+                partes.append(link)
+                anterior = fim
+            partes.append(conteudo[anterior:])
+            return ''.join(partes)
 
         except Exception as e:
             logger.info(f"Erro ao aplicar links em memória: {e}")
@@ -14,7 +14,6 @@ Descrição: Utilitário para cálculo de similaridade vetorial entre embeddings
 """
 
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 
 # ==============================================================================
 # Classe utilitária de similaridade
@@ -32,17 +31,47 @@ class SimilaridadeUtils:
         """
         Calcula a similaridade do cosseno entre dois vetores.
 
+        O cálculo é feito diretamente com o produto interno e as normas, sem
+        matrizes intermédias. Numa entrada bidimensional é usada a primeira linha.
+
         Args:
             v1 (np.ndarray): Vetor 1 (embedding), unidimensional ou matriz.
             v2 (np.ndarray): Vetor 2 (embedding), unidimensional ou matriz.
 
         Returns:
             float: Similaridade do cosseno (valor entre -1 e 1), arredondado a 4 casas decimais.
+            Se um dos vetores for nulo, retorna 0.0.
+        """
+        if v1.ndim != 1:
+            v1 = v1.reshape(-1, v1.shape[-1])[0]
+        if v2.ndim != 1:
+            v2 = v2.reshape(-1, v2.shape[-1])[0]
+
+        normas = float(np.linalg.norm(v1)) * float(np.linalg.norm(v2))
+        if not normas:
+            return 0.0
+        return round(float(np.dot(v1, v2)) / normas, 4)
+
+    @staticmethod
+    def similaridade_matriz(a: np.ndarray, b: np.ndarray, normalizados: bool = True) -> np.ndarray:
         """
-        if v1.ndim == 1:
-            v1 = v1.reshape(1, -1)
-        if v2.ndim == 1:
-            v2 = v2.reshape(1, -1)
+        Calcula a similaridade do cosseno entre todas as linhas de `a` e de `b`.
 
-        score = cosine_similarity(v1, v2)[0][0]
-        return round(float(score), 4)
\ No newline at end of file
+        Com embeddings já normalizados (L2), a similaridade do cosseno é apenas o
+        produto interno, calculado numa única multiplicação de matrizes em float32.
+
+        Args:
+            a (np.ndarray): Matriz (n, d) ou vetor (d,).
+            b (np.ndarray): Matriz (m, d) ou vetor (d,).
+            normalizados (bool): Se False, normaliza as linhas antes do produto.
+
+        Returns:
+            np.ndarray: Matriz (n, m) de similaridades (as dimensões de entradas
+            unidimensionais são removidas).
+        """
+        a = np.asarray(a, dtype=np.float32)
+        b = np.asarray(b, dtype=np.float32)
+        if not normalizados:
+            a = a / np.maximum(np.linalg.norm(a, axis=-1, keepdims=True), np.finfo(np.float32).tiny)
+            b = b / np.maximum(np.linalg.norm(b, axis=-1, keepdims=True), np.finfo(np.float32).tiny)
+        return a @ b.T
\ No newline at end of file
@@ -13,6 +13,7 @@ Descrição: Teste da aplicação de links semânticos e literais sobre parágra
 """
 
 import re
+import numpy as np
 import pytest
 
 from modulos.links_semanticos import GeradorLinksSemanticos
@@ -94,13 +95,12 @@ def test_aplicacao_de_links_literais_ou_semanticos(notas_simuladas):
             emb_origem = gerador.modelo_embeddings.encode(termos_similar_texto)
             emb_destino = gerador.modelo_embeddings.encode(termos_paragrafo_texto)
 
-            for i, vetor_o in enumerate(emb_origem):
-                termo_o = termos_similar_texto[i]
-                for j, vetor_d in enumerate(emb_destino):
-                    termo_d = termos_paragrafo_texto[j]
-                    score = SimilaridadeUtils.similaridade(vetor_o, vetor_d)
-                    if score >= gerador.limiar_similaridade:
-                        termos_para_linkar.add(termo_d)
+            # Todas as similaridades origem x destino numa única multiplicação de matrizes
+            scores = np.round(
+                SimilaridadeUtils.similaridade_matriz(emb_origem, emb_destino, normalizados=False), 4
+            ).reshape(len(termos_similar_texto), len(termos_paragrafo_texto))
+            for j in np.where((scores >= gerador.limiar_similaridade).any(axis=0))[0]:
+                termos_para_linkar.add(termos_paragrafo_texto[j])
 
     texto_com_links = paragrafo
     for termo in sorted(termos_para_linkar, key=len, reverse=True):
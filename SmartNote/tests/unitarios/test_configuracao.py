@@ -14,7 +14,8 @@ Descrição: Testes unitários para o módulo de configuração do sistema.
 
 import json
 import pytest
-from modulos.configuracao import configurador
+from modulos import configuracao
+from modulos.configuracao import configurador, ConfiguradorSmartNote
 
 # ==============================================================================
 # Fixture para Reset Automático
@@ -46,6 +47,59 @@ def test_definir_e_obter_valor_temporario():
     valor = configurador.obter("interface", "tema")
     assert valor == "escuro"
 
+def test_acessores_refletem_alteracoes(tmp_path):
+    """
+    Garante que os acessores memorizados refletem alterações feitas com definir.
+
+    Args:
+        tmp_path (Path): Diretório temporário fornecido pelo pytest.
+    """
+    config = ConfiguradorSmartNote(str(tmp_path / "configuracao.json"))
+    assert config.obter_config_links()["max_links_por_paragrafo"] == 3
+    assert config.snapshot_links.max_links_por_paragrafo == 3
+
+    config.definir("links", "max_links_por_paragrafo", 7)
+    config.definir("modelo_ia", "nome", "llama3")
+
+    assert config.obter_config_links()["max_links_por_paragrafo"] == 7
+    assert config.snapshot_links.max_links_por_paragrafo == 7
+    assert config.obter_config_ollama()["modelo"] == "llama3"
+
+    # Alterar o dicionário devolvido não afeta o valor memorizado
+    config.obter_config_ollama()["modelo"] = "outro"
+    assert config.obter_config_ollama()["modelo"] == "llama3"
+
+def test_salvar_grava_apenas_quando_o_conteudo_muda(tmp_path, monkeypatch):
+    """
+    Garante que alterações feitas no dicionário devolvido por `obter` são gravadas
+    e que um salvamento sem alterações não reescreve o ficheiro.
+
+    Args:
+        tmp_path (Path): Diretório temporário fornecido pelo pytest.
+        monkeypatch (MonkeyPatch): Permite contar as escritas no ficheiro.
+    """
+    caminho = tmp_path / "configuracao.json"
+    config = ConfiguradorSmartNote(str(caminho))
+    assert config.salvar_configuracoes()
+    assert caminho.exists()
+
+    escritas = []
+    escrever = configuracao._escrever_atomico
+    monkeypatch.setattr(configuracao, "_escrever_atomico",
+                        lambda c, d: (escritas.append(c), escrever(c, d)))
+
+    assert config.salvar_configuracoes()
+    assert escritas == []
+
+    config.obter("links")["max_links_por_paragrafo"] = 9
+    assert config.salvar_configuracoes()
+    assert len(escritas) == 1
+    with open(caminho, 'r', encoding='utf-8') as f:
+        assert json.load(f)["links"]["max_links_por_paragrafo"] == 9
+
+    assert ConfiguradorSmartNote(str(caminho)).salvar_configuracoes()
+    assert len(escritas) == 1
+
 # ==============================================================================
 # Testes de Exportação e Importação
 # ==============================================================================
@@ -85,3 +139,24 @@ def test_resetar_configuracoes():
 
     configurador.resetar_para_padrao()
     assert configurador.obter("privacidade", "modo_offline") is True
+
+# ==============================================================================
+# Teste de Validação
+# ==============================================================================
+
+def test_validar_modo_quantizacao(tmp_path):
+    """
+    Garante que apenas os modos de quantização suportados são aceites.
+
+    Args:
+        tmp_path (Path): Diretório temporário fornecido pelo pytest.
+    """
+    configurador_local = ConfiguradorSmartNote(str(tmp_path / "configuracao.json"))
+    assert configurador_local.obter("embeddings", "quantizacao") == "fp32"
+
+    config = configurador_local._carregar_configuracoes_padrao()
+    config["embeddings"]["quantizacao"] = "sq8"
+    assert "embeddings.quantizacao" not in configurador_local.validar_configuracoes(config)
+
+    config["embeddings"]["quantizacao"] = "fp16"
+    assert "embeddings.quantizacao" in configurador_local.validar_configuracoes(config)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+===============================================================================
+Projeto de Engenharia Informática - SmartNote
+Autor: Daniel Gonçalves
+Curso: Engenharia Informática
+Data: 2025
+Ficheiro: test_gerador_links.py
+Descrição: Testes unitários para o fallback semântico do gerador de links.
+===============================================================================
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from modulos.conceitos import extrator_conceitos
+from modulos.gerador_links import GeradorLinksAvancado
+
+# ==============================================================================
+# Modelos Simulados
+# ==============================================================================
+
+VETORES = {
+    "redes neurais": [1.0, 0.0, 0.0],
+    "redes neuronais": [0.9, 0.43589, 0.0],   # Cosseno 0.9 com "redes neurais"
+    "o treino": [0.0, 0.0, 1.0],
+}
+
+TEXTO = "Hoje revi o treino. As redes neuronais aprendem padrões."
+
+
+class ModeloFalso:
+    """
+    Modelo de embeddings simulado, com vetores fixos por texto.
+    """
+
+    def encode(self, textos, **kwargs):
+        return np.array([VETORES.get(t, [0.0, 1.0, 0.0]) for t in textos], dtype=np.float32)
+
+
+class NlpFalso:
+    """
+    Modelo spaCy simulado: os chunks nominais são os textos conhecidos presentes na frase.
+    """
+
+    def __call__(self, frase):
+        chunks = [SimpleNamespace(text=t) for t in VETORES if t in frase.lower()]
+        return SimpleNamespace(noun_chunks=chunks)
+
+    def pipe(self, frases):
+        return (self(frase) for frase in frases)
+
+# ==============================================================================
+# Fixtures
+# ==============================================================================
+
+@pytest.fixture
+def gerador():
+    """
+    Cria um gerador com o modelo de embeddings simulado.
+
+    Returns:
+        GeradorLinksAvancado: Gerador pronto a usar.
+    """
+    gerador = GeradorLinksAvancado()
+    gerador.modelo_embeddings = ModeloFalso()
+    gerador.dimensao_embeddings = 3
+    return gerador
+
+
+@pytest.fixture
+def nlp(monkeypatch):
+    """
+    Substitui o modelo spaCy do extrator de conceitos pelo modelo simulado.
+    """
+    monkeypatch.setattr(extrator_conceitos, "_nlp", NlpFalso())
+    monkeypatch.setattr(extrator_conceitos, "_nlp_carregado", True)
+
+# ==============================================================================
+# Testes do Fallback Semântico
+# ==============================================================================
+
+def test_termo_similar_encontrado_no_texto(gerador, nlp):
+    """
+    Verifica se o termo mais semelhante do texto é devolvido com a sua posição.
+    """
+    resultado = gerador.encontrar_termo_similar_no_texto(TEXTO, "redes neurais")
+
+    assert resultado is not None
+    termo, inicio, fim, contexto = resultado
+    assert termo == "redes neuronais"
+    assert TEXTO[inicio:fim].lower() == "redes neuronais"
+    assert contexto == "As redes neuronais aprendem padrões."
+
+
+def test_termo_similar_abaixo_da_tolerancia(gerador, nlp):
+    """
+    Verifica que nenhum termo é devolvido quando a similaridade não atinge a tolerância.
+    """
+    assert gerador.encontrar_termo_similar_no_texto(TEXTO, "redes neurais", tolerancia=0.95) is None
+
+
+def test_termo_similar_sem_modelo_spacy(gerador, monkeypatch):
+    """
+    Verifica que, sem modelo spaCy, não há candidatos nem erro.
+    """
+    monkeypatch.setattr(extrator_conceitos, "_nlp", None)
+    monkeypatch.setattr(extrator_conceitos, "_nlp_carregado", True)
+
+    assert gerador.encontrar_termo_similar_no_texto(TEXTO, "redes neurais") is None
+
+
+def test_erro_na_busca_nao_fica_em_cache(gerador, nlp):
+    """
+    Verifica que uma busca que falha com erro é repetida na chamada seguinte.
+    """
+    def falhar(texto):
+        raise RuntimeError("falha simulada")
+
+    gerador._obter_candidatos_do_texto = falhar
+    assert gerador.encontrar_termo_similar_no_texto(TEXTO, "redes neurais") is None
+
+    del gerador._obter_candidatos_do_texto
+    assert gerador.encontrar_termo_similar_no_texto(TEXTO, "redes neurais") is not None
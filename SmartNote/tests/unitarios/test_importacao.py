@@ -81,6 +81,26 @@ def test_importar_arquivo_sem_frontmatter(diretorio_temporario):
     assert nota.erro is None
     assert erros == []
 
+def test_importar_txt_mantem_delimitadores(diretorio_temporario):
+    """
+    Testa se um ficheiro .txt que começa por "---" é importado sem extrair frontmatter.
+
+    Args:
+        diretorio_temporario (Path): Diretório onde o ficheiro será criado.
+    """
+    arquivo = diretorio_temporario / "nota.txt"
+    conteudo = "---\nSecção: Introdução\n---\nTexto simples."
+    arquivo.write_text(conteudo, encoding="utf-8")
+
+    notas, erros = importar_diretorio(str(diretorio_temporario))
+
+    assert len(notas) == 1
+    nota = notas[0]
+    assert nota.frontmatter == {}
+    assert nota.conteudo == conteudo
+    assert nota.valida is True
+    assert erros == []
+
 def test_importar_diretorio_vazio(diretorio_temporario):
     """
     Testa a importação de um diretório vazio.
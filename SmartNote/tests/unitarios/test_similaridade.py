@@ -87,3 +87,17 @@ def test_similaridade_vetores_aleatorios():
 
     assert -1.0 <= score <= 1.0
     assert isinstance(score, float)
+
+def test_similaridade_matriz_coincide_com_pares():
+    """
+    Testa se a similaridade em matriz coincide com o cálculo par a par.
+    """
+    np.random.seed(7)
+    a = np.random.rand(4, 16)
+    b = np.random.rand(3, 16)
+    matriz = SimilaridadeUtils.similaridade_matriz(a, b, normalizados=False)
+
+    assert matriz.shape == (4, 3)
+    for i in range(4):
+        for j in range(3):
+            assert abs(matriz[i, j] - SimilaridadeUtils.similaridade(a[i], b[j])) < 1e-3